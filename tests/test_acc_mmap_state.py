@@ -0,0 +1,51 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.acc.poly import CoeffView, pack_coeffs, poly_eval, unpack_coeffs
+from vds.acc.vds_acc import VDSACC
+from vds.storage.filestore import FileStore
+from vds.storage.mmarray import GrowableArray
+
+
+def test_growable_array_appends_in_place(tmp_path):
+    arr = GrowableArray(tmp_path / "a.arr", capacity=2)
+    arr.extend([b"%04d" % i for i in range(3)])
+    view = arr.view()
+    arr.extend([b"%04d" % i for i in range(3, 100)])  # remaps; the old view stays readable
+    assert bytes(view) == b"000000010002"
+    assert len(arr) == 100 and arr[-1] == b"0099" and arr.width == 4
+    assert list(arr.iter(10, 12)) == [b"0010", b"0011"]
+    arr.close()
+    again = GrowableArray(tmp_path / "a.arr")
+    assert len(again) == 100 and bytes(again.view()[:8]) == b"00000001"
+
+
+def test_coeff_view_streams_packed_coefficients():
+    p = 101
+    coeffs = [3, 0, 7, 100, 1]
+    buf = pack_coeffs(coeffs, 1)
+    view = CoeffView(buf, 1)
+    assert list(view) == coeffs and list(reversed(view)) == coeffs[::-1]
+    assert poly_eval(p, view, 5) == poly_eval(p, coeffs, 5)
+
+
+def test_acc_powers_and_poly_are_mapped(tmp_path):
+    grp = PairingGroup('MNT224')
+    base = str(tmp_path / "acc")
+    with FileStore(base) as fs:
+        v = VDSACC(fs, grp)
+        pub, st = v.setup()
+        for i in range(1, 6):
+            v.append(st, b"item-%d" % i)
+        for i in (1, 3, 1):
+            pub.accumulator = v.update(st, i, b"new-%d" % i).root.value
+        pub.accumulator = v.update_many(st, {2: b"two", 4: b"four"})[0].root.value
+        # U = 5 additions: f has 6 coefficients, the table 7 powers
+        assert len(fs.acc_powers()) == 7
+        assert isinstance(fs.get_acc_poly(), memoryview)
+        assert len(unpack_coeffs(fs.get_acc_poly(), v._width)) == 6
+
+    with FileStore(base) as fs:
+        v = VDSACC(fs, grp)
+        assert len(fs.acc_powers()) == 7
+        for i, d in [(1, b"new-1"), (2, b"two"), (3, b"new-3"), (5, b"item-5")]:
+            assert v.verify(pub, i, d, v.query(i))
+        assert v.verify(pub, 4, b"four", v.query_owner(st, 4))
@@ -0,0 +1,36 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.acc.parallel import ParallelProver
+from vds.acc.vds_acc import VDSACC
+from vds.storage.memstore import MemStore
+
+
+def test_parallel_witnesses_match_local_proofs():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    local = VDSACC(store, grp, witness_cache_size=0)
+    pub, st = local.setup()
+    for i in range(1, 13):
+        local.append(st, b"item-%d" % i)
+    pub.accumulator = local.update_many(st, {i: b"new-%d" % i for i in (2, 4, 6, 8, 10)})[0].root.value
+
+    # min_chunk=2 splits each 5-term quotient across several work units
+    with ParallelProver('MNT224', processes=2, min_chunk=2) as prover:
+        par = VDSACC(store, grp, witness_cache_size=0, prover=prover)
+        idxs = list(range(1, 13))
+        proofs = par.query_many(idxs)
+        for i, pr in zip(idxs, proofs):
+            data = b"new-%d" % i if i in (2, 4, 6, 8, 10) else b"item-%d" % i
+            assert pr.payload == local.query(i).payload
+            assert par.verify(pub, i, data, pr)
+        name = prover._table[0]
+
+        # the table grows in place after an update; workers read only their units' ranges
+        pub.accumulator = local.update(st, 3, b"THREE").root.value
+        assert par.verify(pub, 3, b"THREE", par.query(3))
+        assert prover._table[0] == name and prover._table[2] == len(store.acc_powers())
+
+        # a new epoch has a different table: published in a fresh block
+        pub1, st1 = local.rotate()
+        pub1.accumulator = local.update(st1, 7, b"SEVEN").root.value
+        assert par.verify(pub1, 5, b"item-5", par.query(5))
+        assert prover._table[0] != name
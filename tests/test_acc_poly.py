@@ -0,0 +1,60 @@
+import random
+
+from vds.acc import poly
+
+# 224-bit prime standing in for the group order
+P = 2**224 - 2**96 + 1
+
+
+def _rand(n):
+    return [random.randrange(P) for _ in range(n)]
+
+
+def _school(a, b):
+    res = [0] * (len(a) + len(b) - 1)
+    for i, ai in enumerate(a):
+        for j, bj in enumerate(b):
+            res[i + j] = (res[i + j] + ai * bj) % P
+    return res
+
+
+def test_mul_matches_schoolbook():
+    for la, lb in ((1, 1), (3, 40), (30, 30), (61, 100)):
+        a, b = _rand(la), _rand(lb)
+        assert poly.poly_mul(P, a, b) == _school(a, b)
+
+
+def test_divmod_and_linear_division():
+    a = _rand(300)
+    m = _rand(100) + [1]
+    q, r = poly.poly_divmod_monic(P, a, m)
+    back = poly.poly_mul(P, m, q)
+    for i, c in enumerate(r):
+        back[i] = (back[i] + c) % P
+    assert back == a
+
+    y = random.randrange(P)
+    Q, v = poly.poly_div_linear(P, a, y)
+    assert v == poly.poly_eval(P, a, -y % P)
+    assert poly.poly_mul_linear(P, Q, y)[1:] == a[1:]
+
+    # packed, streamed from a view: same result as the list version
+    w = poly.coeff_width(P)
+    view = poly.CoeffView(poly.pack_coeffs(a, w), w)
+    assert poly.poly_div_linear(P, view, y) == (Q, v)
+    assert poly.poly_mul_linear_packed(P, view, y, w) == poly.pack_coeffs(poly.poly_mul_linear(P, a, y), w)
+
+
+def test_remainder_tree_evaluates_all_points():
+    xs = _rand(33)
+    f = _rand(200)
+    levels = poly.subproduct_tree(P, xs)
+    assert poly.remainder_tree(P, levels, f) == [poly.poly_eval(P, f, -x % P) for x in xs]
+
+
+def test_pack_roundtrip():
+    f = _rand(17) + [0, 1]
+    w = poly.coeff_width(P)
+    buf = poly.pack_coeffs(f, w)
+    assert len(buf) == w * len(f)
+    assert poly.unpack_coeffs(buf, w) == f
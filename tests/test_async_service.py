@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.acc.vds_acc import VDSACC
+from vds.cli.aio import CoalescingService
+from vds.common.errors import StorageError
+from vds.common.types import QueryProof
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_concurrent_acc_queries_share_one_batch(monkeypatch):
+    grp = PairingGroup('MNT224')
+    vds = VDSACC(MemStore(), grp, witness_cache_size=0)
+    pub, st = vds.setup()
+    for i in range(1, 9):
+        vds.append(st, b"item-%d" % i)
+    pub.accumulator = vds.update(st, 3, b"THREE").root.value
+
+    calls = []
+    real = VDSACC.query_many
+    monkeypatch.setattr(VDSACC, "query_many", lambda self, idxs, epoch=None: calls.append(list(idxs)) or real(self, idxs, epoch))
+
+    async def main():
+        svc = CoalescingService(vds, window=0.01)
+        idxs = [1, 2, 3, 3, 5, 8, 1]
+        proofs = await asyncio.gather(*(svc.query(i) for i in idxs))
+        oks = await asyncio.gather(*(svc.verify(pub, i, b"THREE" if i == 3 else b"item-%d" % i, p) for i, p in zip(idxs, proofs)))
+        bad = await svc.verify(pub, 2, b"forged", proofs[1])
+        with pytest.raises(StorageError):
+            await asyncio.gather(svc.query(4), svc.query(99))
+        stats = dict(svc.stats)
+        await svc.close()
+        return oks, bad, stats
+
+    oks, bad, stats = asyncio.run(main())
+    assert all(oks) and not bad
+    # first batch: duplicates proved once, in a single query_many call
+    assert calls[0] == [1, 2, 3, 5, 8]
+    assert stats["queries"] == 9 and stats["verifies"] == 8
+
+
+def test_cvc_requests_run_off_the_loop():
+    grp = PairingGroup('SS512')
+    vds = VDSCVC(MemStore(), grp, q=4)
+    st, _ = vds.setup()
+
+    async def main():
+        svc = CoalescingService(vds, window=0.005, max_batch=4)
+        for i in range(1, 11):
+            await svc.append(st, b"item-%d" % i)
+        await svc.update(st, 6, b"six")
+        proofs = await asyncio.gather(*(svc.query(i) for i in range(1, 11)))
+        data = [b"six" if i == 6 else b"item-%d" % i for i in range(1, 11)]
+        oks = await asyncio.gather(*(svc.verify(st, i, d, p) for i, d, p in zip(range(1, 11), data, proofs)))
+        await svc.close()
+        return oks, svc.stats
+
+    oks, stats = asyncio.run(main())
+    assert all(oks)
+    # max_batch=4 splits the 10 queries and 10 verifications into several batches
+    assert stats["batches"] >= 3 and stats["queries"] == 10
+
+
+def test_malformed_proof_fails_only_its_own_verification():
+    grp = PairingGroup('MNT224')
+    vds = VDSACC(MemStore(), grp)
+    pub, st = vds.setup()
+    for i in range(1, 5):
+        vds.append(st, b"item-%d" % i)
+    proofs = vds.query_many([1, 2, 3, 4])
+    broken = QueryProof(scheme="acc", index=3, payload=b"\x00not msgpack")
+
+    async def main():
+        svc = CoalescingService(vds, window=0.01)
+        checks = [svc.verify(pub, i, b"item-%d" % i, p) for i, p in zip((1, 2, 4), (proofs[0], proofs[1], proofs[3]))]
+        results = await asyncio.gather(svc.verify(pub, 3, b"item-3", broken), *checks, return_exceptions=True)
+        stats = dict(svc.stats)
+        await svc.close()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    assert isinstance(results[0], Exception)
+    assert results[1:] == [True, True, True]
+    assert stats["batches"] == 1
@@ -5,3 +5,18 @@ import pytest
 def test_cvc_core_stub():
     pass
 
+
+
+def test_sparse_and_dense_vectors_commit_alike():
+    from charm.toolbox.pairinggroup import PairingGroup, ZR
+    from vds.cvc.cvc_core import keygen, commit_vec, open_slot
+
+    grp = PairingGroup('SS512')
+    q = 4
+    pk, sk, boot = keygen(grp, q)
+    r = grp.random(ZR)
+    sparse = {1: grp.random(ZR), 4: grp.random(ZR)}
+    dense = [sparse.get(k, grp.init(ZR, 0)) for k in range(1, q + 2)]
+    assert commit_vec(grp, pk.g, boot["h_list"], sparse, r) == commit_vec(grp, pk.g, boot["h_list"], dense, r)
+    row = {k: boot["hij"][(2, k)] for k in range(1, q + 2) if k != 2}
+    assert open_slot(grp, boot["h_list"][1], row, sparse, r) == open_slot(grp, boot["h_list"][1], row, dense, r)
@@ -0,0 +1,38 @@
+import pytest
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.common.errors import GroupError
+from vds.cvc.params import CVCParamBundle
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_param_bundle_roundtrip(tmp_path):
+    grp = PairingGroup('SS512')
+    path = tmp_path / "cvc.params"
+    v = VDSCVC(MemStore(), grp, q=4)
+    st, _ = v.setup(params_path=str(path))
+    items = [b"item-%d" % i for i in range(1, 8)]
+    for d in items:
+        v.append(st, d)
+    v.params.close()
+
+    # a second process maps the same bundle: same keys, same tree, no keygen
+    w = VDSCVC(MemStore(), grp, q=4)
+    st2, _ = w.setup(params_path=str(path), sk=st.sk)
+    assert st2.pk == st.pk
+    for d in items:
+        w.append(st2, d)
+    assert st2.root == st.root
+    assert w.verify(st2, 5, items[4], w.query(5))
+
+    # rows used above were written back; reading them needs no trapdoors
+    ro = CVCParamBundle(path, grp, writable=False)
+    assert ro.hij[(1, 2)] == w._bootstrap["hij"][(1, 2)]
+    assert ro.hij[(2, 1)] == ro.hij[(1, 2)]
+
+    # a fresh bundle has no rows yet; without the owner's trapdoors they cannot be filled
+    fresh = tmp_path / "fresh.params"
+    b, _, _ = CVCParamBundle.create(fresh, grp, q=4)
+    b.close()
+    with pytest.raises(GroupError):
+        CVCParamBundle(fresh, grp, writable=False).hij[(1, 2)]
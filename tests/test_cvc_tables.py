@@ -0,0 +1,58 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.cvc import cvc_core
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_base_tables_shared_and_budgeted(tmp_path):
+    grp = PairingGroup('SS512')
+    cvc_core.clear_base_tables()
+    try:
+        path = str(tmp_path / "cvc.params")
+        v = VDSCVC(MemStore(), grp, q=4)
+        st, _ = v.setup(params_path=path)
+        w = VDSCVC(MemStore(), grp, q=4)
+        st2, _ = w.setup(params_path=path, sk=st.sk)
+        # same parameter set -> one set of tables for both instances
+        assert w._tables is v._tables
+        items = [b"item-%d" % i for i in range(1, 10)]
+        v.append_many(st, items)
+        assert v.verify(st, 7, items[6], v.query(7))
+        fp = cvc_core.table_footprint()
+        assert fp["parameter_sets"] == 1
+        assert fp["tables"] >= 1 + 5 and 0 < fp["table_bytes"] <= fp["limit"]
+
+        # with no budget left, bases are used without tables and results are unchanged
+        cvc_core.clear_base_tables()
+        cvc_core.set_table_budget(0)
+        u = VDSCVC(MemStore(), grp, q=4)
+        st3, _ = u.setup(params_path=path, sk=st.sk)
+        u.append_many(st3, items)
+        assert st3.root == st.root
+        assert u.verify(st3, 7, items[6], u.query(7))
+        assert cvc_core.table_footprint()["tables"] == 0
+    finally:
+        cvc_core.set_table_budget(cvc_core.DEFAULT_TABLE_BUDGET)
+        cvc_core.clear_base_tables()
+
+
+def test_registry_evicts_least_recent_set_over_budget():
+    grp = PairingGroup('SS512')
+    cvc_core.clear_base_tables()
+    try:
+        v = VDSCVC(MemStore(), grp, q=4)
+        st, _ = v.setup()
+        # exactly one parameter set fits the budget
+        cvc_core.set_table_budget(cvc_core.table_footprint()["used"])
+        w = VDSCVC(MemStore(), grp, q=4)
+        st2, _ = w.setup()
+        fp = cvc_core.table_footprint()
+        assert fp["parameter_sets"] == 1 and fp["used"] <= fp["limit"]
+        # the evicted set is no longer shared, but its holder keeps working
+        v.append(st, b"x")
+        w.append(st2, b"y")
+        assert v.verify(st, 1, b"x", v.query(1))
+        assert w.verify(st2, 1, b"y", w.query(1))
+    finally:
+        cvc_core.set_table_budget(cvc_core.DEFAULT_TABLE_BUDGET)
+        cvc_core.clear_base_tables()
@@ -0,0 +1,124 @@
+import socket
+import threading
+
+import msgpack
+import pytest
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.acc.vds_acc import VDSACC
+from vds.cli.daemon import Daemon, Session
+from vds.cli.protocol import Client
+from vds.common.errors import StorageError
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.filestore import FileStore
+
+
+def _acc_state(tmp_path):
+    # same layout as `vds_cli init --scheme acc`
+    with FileStore(str(tmp_path / "s.data")) as fs:
+        pub, st = VDSACC(fs, PairingGroup('MNT224')).setup()
+    state = {"scheme": "acc", "curve": "MNT224", "pub": pub.model_dump(), "client_state": st, "data": "s.data"}
+    (tmp_path / "s").write_bytes(msgpack.packb(state, use_bin_type=True))
+    return str(tmp_path / "s")
+
+
+def _cvc_state(tmp_path):
+    with FileStore(str(tmp_path / "s.nodes")) as fs:
+        v = VDSCVC(fs, PairingGroup('SS512'), q=4)
+        st, _ = v.setup(params_path=str(tmp_path / "s.params"))
+        v.params.close()
+    cs = {"pk": st.pk.model_dump(), "sk": st.sk.model_dump(), "root": st.root.model_dump(), "cnt": st.cnt}
+    state = {"scheme": "cvc", "curve": "SS512", "q": 4, "params": "s.params", "nodes": "s.nodes", "client_state": cs, "items": {}}
+    (tmp_path / "s").write_bytes(msgpack.packb(state, use_bin_type=True))
+    return str(tmp_path / "s")
+
+
+@pytest.mark.parametrize("make_state", [_acc_state, _cvc_state])
+def test_daemon_serves_requests_over_socket(tmp_path, make_state):
+    state_path = make_state(tmp_path)
+    sock = str(tmp_path / "s.sock")
+    d = Daemon(Session(state_path), sock, allow_shutdown=True)
+    t = threading.Thread(target=d.serve_forever, daemon=True)
+    t.start()
+    try:
+        with Client(sock) as c:
+            for i in range(1, 6):
+                assert c.call("append", data=b"item-%d" % i)["index"] == i
+            c.call("update", index=2, data=b"TWO")
+            proof = c.call("query", index=2)["proof"]
+            assert c.call("verify", index=2, data=b"TWO", proof=proof)["ok"]
+            assert not c.call("verify", index=2, data=b"item-2", proof=proof)["ok"]
+            with pytest.raises(StorageError):
+                c.call("no-such-op")
+            # a second client is served while the first stays connected
+            with Client(sock) as c2:
+                assert c2.call("ping")["scheme"] == d.session.scheme
+            c.call("shutdown")
+        t.join(5)
+        assert not t.is_alive()
+    finally:
+        d.server_close()
+
+    # the state file and store were kept current: a fresh session continues
+    s = Session(state_path)
+    try:
+        proof = s.handle({"op": "query", "index": 5})["proof"]
+        assert s.handle({"op": "verify", "index": 5, "data": b"item-5", "proof": proof})["ok"]
+        proof = s.handle({"op": "query", "index": 2})["proof"]
+        assert s.handle({"op": "verify", "index": 2, "data": b"TWO", "proof": proof})["ok"]
+    finally:
+        s.close()
+
+
+def test_daemon_acc_append_after_update_keeps_root(tmp_path):
+    state_path = _acc_state(tmp_path)
+    s = Session(state_path)
+    try:
+        s.handle({"op": "append", "data": b"a"})
+        s.handle({"op": "update", "index": 1, "data": b"A"})
+        # append returns the accumulator after the update, not the one in st
+        s.handle({"op": "append", "data": b"b"})
+        for idx, data in ((1, b"A"), (2, b"b")):
+            proof = s.handle({"op": "query", "index": idx})["proof"]
+            assert s.handle({"op": "verify", "index": idx, "data": data, "proof": proof})["ok"]
+    finally:
+        s.close()
+    saved = msgpack.unpackb((tmp_path / "s").read_bytes(), raw=False)
+    with FileStore(str(tmp_path / "s.data")) as fs:
+        assert saved["pub"]["accumulator"] == fs.get_acc_value()
+
+
+def test_daemon_keeps_a_live_socket_and_gates_shutdown(tmp_path):
+    state_path = _acc_state(tmp_path)
+    sock = str(tmp_path / "s.sock")
+    d = Daemon(Session(state_path), sock)
+    t = threading.Thread(target=d.serve_forever, daemon=True)
+    t.start()
+    try:
+        # a second daemon does not take the socket of a running one
+        s2 = Session(state_path)
+        with pytest.raises(StorageError):
+            Daemon(s2, sock)
+        s2.close()
+        with Client(sock) as c:
+            with pytest.raises(StorageError):
+                c.call("shutdown")
+            assert c.call("ping")["scheme"] == "acc"
+    finally:
+        d.shutdown()
+        t.join(5)
+        d.server_close()
+
+    # a stale socket file left behind by a dead daemon is replaced
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(sock)
+    stale.close()
+    d = Daemon(Session(state_path), sock)
+    t = threading.Thread(target=d.serve_forever, daemon=True)
+    t.start()
+    try:
+        with Client(sock) as c:
+            assert c.call("ping")["scheme"] == "acc"
+    finally:
+        d.shutdown()
+        t.join(5)
+        d.server_close()
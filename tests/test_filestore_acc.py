@@ -0,0 +1,61 @@
+import struct
+
+import pytest
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.acc.vds_acc import VDSACC
+from vds.common.errors import StorageError
+from vds.storage.filestore import FileStore
+
+
+def test_acc_state_survives_reopen_and_rotation(tmp_path):
+    grp = PairingGroup('MNT224')
+    base = str(tmp_path / "acc")
+    with FileStore(base) as fs:
+        v = VDSACC(fs, grp)
+        pub, st = v.setup()
+        for d in (b"one", b"two", b"three"):
+            v.append(st, d)
+        pub.accumulator = v.update(st, 2, b"TWO").root.value
+
+    with FileStore(base) as fs:
+        v = VDSACC(fs, grp)
+        assert fs.acc_count() == 3
+        assert v.verify(pub, 2, b"TWO", v.query(2))
+        assert v.verify(pub, 3, b"three", v.query(3))
+        pub1, st1 = v.rotate()
+        assert v.verify(pub1, 1, b"one", v.query(1))
+        assert v.verify(pub, 1, b"one", v.query(1, epoch=pub.epoch))
+
+    with FileStore(base) as fs:
+        v = VDSACC(fs, grp)
+        assert fs.acc_epoch() == pub1.epoch
+        assert v.verify(pub, 3, b"three", v.query(3, epoch=pub.epoch))
+        v.cutover(pub.epoch)
+        with pytest.raises(StorageError):
+            v.query(1, epoch=pub.epoch)
+
+
+def test_torn_tail_is_truncated_and_unindexed_frames_replayed(tmp_path):
+    base = tmp_path / "items"
+    with FileStore(str(base), sync_every=1) as fs:
+        for i in range(1, 6):
+            fs.save_acc_item(i, b"data-%d" % i, b"t" * 16, b"s-%d" % i)
+    log = base / "acc_items.log"
+    good = log.stat().st_size
+
+    # crash in the middle of a frame: header written, payload cut short
+    with open(log, "ab") as fh:
+        fh.write(struct.pack(">IIQB", 100, 0, 6, 1) + b"partial")
+    with FileStore(str(base)) as fs:
+        assert fs.acc_count() == 5
+        assert log.stat().st_size == good
+        assert fs.get_acc_item(5) == (b"data-5", b"t" * 16, 5, b"s-5")
+        fs.save_acc_item(6, b"data-6", b"t" * 16, b"s-6")
+
+    # crash after the frames but before the index header: frames are re-indexed
+    with open(base / "acc_items.idx", "r+b") as fh:
+        fh.write(struct.pack(">QQ", 0, 0))
+    with FileStore(str(base)) as fs:
+        assert fs.acc_count() == 6
+        assert [it[2] for it in fs.iter_acc_items()] == [1, 2, 3, 4, 5, 6]
+        assert fs.get_acc_item(6)[0] == b"data-6"
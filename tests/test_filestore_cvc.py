@@ -0,0 +1,34 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.filestore import FileStore
+
+
+def test_cvc_tree_survives_reopen(tmp_path):
+    grp = PairingGroup('SS512')
+    params = str(tmp_path / "cvc.params")
+    nodes = str(tmp_path / "nodes")
+
+    with FileStore(nodes) as fs:
+        v = VDSCVC(fs, grp, q=4)
+        st, _ = v.setup(params_path=params)
+        items = {i: b"item-%d" % i for i in range(1, 12)}
+        for i in range(1, 12):
+            v.append(st, items[i])
+        items[6] = b"item-6'"
+        v.update(st, 6, items[6])
+        v.params.close()
+
+    # a fresh process sees the same tree without replaying anything
+    with FileStore(nodes) as fs:
+        w = VDSCVC(fs, grp, q=4)
+        st2, _ = w.setup(params_path=params, sk=st.sk)
+        assert st2.cnt == 11 and st2.root == st.root
+        # update versions live in the client state, like the root
+        st2.versions = dict(st.versions)
+        assert w.verify(st2, 6, items[6], w.query(6))
+        # only the authentication path of item 6 was decoded
+        assert set(w._nodes) == {1, 2, 6}
+        w.append(st2, b"item-12")
+        assert w.verify(st2, 12, b"item-12", w.query(12))
+        assert w.verify(st2, 9, items[9], w.query(9))
+        w.params.close()
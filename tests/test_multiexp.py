@@ -0,0 +1,19 @@
+from charm.toolbox.pairinggroup import PairingGroup, G1, ZR
+from vds.common.multiexp import multiexp, multiexp_naive
+
+
+def test_multiexp_matches_naive():
+    grp = PairingGroup('MNT224')
+    identity = grp.init(G1, 1)
+    for n in (0, 1, 5, 40, 200):
+        bases = [grp.random(G1) for _ in range(n)]
+        exps = [grp.random(ZR) for _ in range(n)]
+        assert multiexp(grp, bases, exps, identity) == multiexp_naive(grp, bases, exps, identity)
+
+
+def test_multiexp_accepts_int_exponents_and_zeros():
+    grp = PairingGroup('MNT224')
+    identity = grp.init(G1, 1)
+    bases = [grp.random(G1) for _ in range(20)]
+    exps = [0 if k % 3 == 0 else k * 12345 for k in range(20)]
+    assert multiexp(grp, bases, exps, identity) == multiexp_naive(grp, bases, exps, identity)
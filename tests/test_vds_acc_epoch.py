@@ -0,0 +1,42 @@
+import pytest
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.storage.memstore import MemStore
+from vds.acc.vds_acc import VDSACC
+from vds.common.errors import StorageError
+
+
+def test_rotate_resets_accumulator_and_keeps_old_epoch_until_cutover():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    vds = VDSACC(store, grp)
+    pub0, st0 = vds.setup()
+
+    vds.append(st0, b"one")
+    vds.append(st0, b"two")
+    ur = vds.update(st0, 1, b"ONE")
+    pub0.accumulator = ur.root.value
+
+    pub1, st1 = vds.rotate()
+    assert pub1.epoch == pub0.epoch + 1
+    _, powers = store.get_acc_state()
+    assert len(powers) == 2  # back to U = 0
+
+    # new epoch serves the live items
+    p1 = vds.query(1)
+    assert vds.verify(pub1, 1, b"ONE", p1)
+    assert not vds.verify(pub0, 1, b"ONE", p1)
+    # old epoch still verifiable until cut-over
+    p0 = vds.query(1, epoch=pub0.epoch)
+    assert vds.verify(pub0, 1, b"ONE", p0)
+    assert not vds.verify(pub1, 1, b"ONE", p0)
+
+    # appends and updates continue in the new epoch
+    vds.append(st1, b"three")
+    ur = vds.update(st1, 2, b"TWO")
+    pub1.accumulator = ur.root.value
+    assert vds.verify(pub1, 2, b"TWO", vds.query(2))
+    assert vds.verify(pub1, 3, b"three", vds.query(3))
+
+    vds.cutover(pub0.epoch)
+    with pytest.raises(StorageError):
+        vds.query(1, epoch=pub0.epoch)
@@ -0,0 +1,22 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.storage.memstore import MemStore
+from vds.acc.vds_acc import VDSACC
+
+
+def test_owner_proof_matches_server_proof():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    vds = VDSACC(store, grp)
+    pub, st = vds.setup()
+
+    for d in (b"a", b"b", b"c", b"d"):
+        vds.append(st, d)
+    for idx, d in ((1, b"A"), (3, b"C"), (1, b"AA")):
+        ur = vds.update(st, idx, d)
+        pub.accumulator = ur.root.value
+
+    for idx, d in ((1, b"AA"), (2, b"b"), (4, b"d")):
+        fast = vds.query_owner(st, idx)
+        assert vds.verify(pub, idx, d, fast)
+        # same witness as the server-side computation
+        assert fast.payload == vds.query(idx).payload
@@ -0,0 +1,26 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.storage.memstore import MemStore
+from vds.acc.vds_acc import VDSACC
+from vds.acc.verifier import PreparedVerifier
+
+
+def test_prepared_verifier_tracks_root():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    vds = VDSACC(store, grp)
+    pub, st = vds.setup()
+
+    vds.append(st, b"p")
+    vds.append(st, b"q")
+    pv = PreparedVerifier(grp, pub)
+    proof = vds.query(2)
+    assert pv.verify(2, b"q", proof)
+    assert not pv.verify(2, b"Q", proof)
+
+    ur = vds.update(st, 1, b"P")
+    pub.accumulator = ur.root.value
+    assert not pv.matches(pub)
+    # VDSACC.verify rebuilds its prepared verifier for the new root
+    assert vds.verify(pub, 1, b"P", vds.query(1))
+    assert vds.prepare_verifier(pub).matches(pub)
+    assert not vds.verify(pub, 2, b"q", proof)
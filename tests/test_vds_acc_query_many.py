@@ -0,0 +1,26 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.storage.memstore import MemStore
+from vds.acc.vds_acc import VDSACC
+
+
+def test_query_many_proofs_verify():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    vds = VDSACC(store, grp)
+    pub, st = vds.setup()
+
+    items = {i: bytes([i]) * 8 for i in range(1, 8)}
+    for i in range(1, 8):
+        vds.append(st, items[i])
+    # grow f(X) so every quotient has several coefficients
+    for i in (2, 5, 6):
+        items[i] = b"upd-" + items[i]
+        ur = vds.update(st, i, items[i])
+        pub.accumulator = ur.root.value
+
+    indices = [7, 1, 5, 3, 6]
+    proofs = vds.query_many(indices)
+    assert [p.index for p in proofs] == indices
+    for i, p in zip(indices, proofs):
+        assert vds.verify(pub, i, items[i], p)
+    assert vds.query_many([]) == []
@@ -0,0 +1,31 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.storage.memstore import MemStore
+from vds.acc.vds_acc import VDSACC
+
+
+def test_update_many_matches_sequential_updates():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    vds = VDSACC(store, grp)
+    pub, st = vds.setup()
+
+    items = {i: b"row-%d" % i for i in range(1, 7)}
+    for i in range(1, 7):
+        vds.append(st, items[i])
+    ur = vds.update(st, 6, b"row-6b")
+    items[6] = b"row-6b"
+    pub.accumulator = ur.root.value
+
+    old_proof = vds.query(2)
+    batch = {2: b"ROW-2", 4: b"ROW-4", 5: b"ROW-5"}
+    receipts = vds.update_many(st, batch)
+    assert [r.index for r in receipts] == [2, 4, 5]
+    items.update(batch)
+    pub.accumulator = receipts[0].root.value
+
+    _, powers = store.get_acc_state()
+    assert len(powers) == 2 + 4  # four additions in total
+    assert not vds.verify(pub, 2, b"row-2", old_proof)
+    for i in range(1, 7):
+        assert vds.verify(pub, i, items[i], vds.query(i))
+    assert vds.update_many(st, {}) == []
@@ -0,0 +1,32 @@
+from charm.toolbox.pairinggroup import PairingGroup, ZR
+from vds.storage.memstore import MemStore
+from vds.acc.vds_acc import VDSACC
+from vds.common import ser
+from vds.common.types import QueryProof
+
+
+def test_verify_many_flags_bad_proofs():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    vds = VDSACC(store, grp)
+    pub, st = vds.setup()
+
+    items = {i: b"v%d" % i for i in range(1, 11)}
+    for i in range(1, 11):
+        vds.append(st, items[i])
+    ur = vds.update(st, 4, b"v4'")
+    items[4] = b"v4'"
+    pub.accumulator = ur.root.value
+
+    batch = [(i, items[i], p) for i, p in zip(range(1, 11), vds.query_many(list(range(1, 11))))]
+    assert vds.verify_many(pub, batch) == [True] * 10
+
+    # wrong data (signature fails) and a tampered witness value (pairing fails)
+    batch[2] = (3, b"nope", batch[2][2])
+    payload = ser.unpack(batch[7][2].payload, dict)
+    payload["u"] = grp.serialize(grp.deserialize(payload["u"]) + grp.init(ZR, 1))
+    batch[7] = (8, items[8], QueryProof(scheme="acc", index=8, payload=ser.pack(payload)))
+    expected = [True] * 10
+    expected[2] = expected[7] = False
+    assert vds.verify_many(pub, batch) == expected
+    assert vds.verify_many(pub, []) == []
@@ -0,0 +1,31 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.storage.memstore import MemStore
+from vds.acc.vds_acc import VDSACC
+
+
+def test_cached_witnesses_follow_updates():
+    grp = PairingGroup('MNT224')
+    store = MemStore()
+    vds = VDSACC(store, grp, witness_cache_size=2)
+    pub, st = vds.setup()
+
+    items = {i: b"item-%d" % i for i in range(1, 6)}
+    for i in range(1, 6):
+        vds.append(st, items[i])
+    # warm the cache; capacity 2 evicts index 1
+    for i in (1, 2, 3):
+        vds.query(i)
+    assert len(vds.witness_cache) == 2
+
+    for i in (4, 5, 4, 2):
+        items[i] = items[i] + b"'"
+        ur = vds.update(st, i, items[i])
+        pub.accumulator = ur.root.value
+    # index 2 was re-signed, so only 3 is still cached
+    assert vds.witness_cache.get(3, store.get_acc_item(3)[3]) is not None
+
+    uncached = VDSACC(store, grp, witness_cache_size=0)
+    for i in range(1, 6):
+        proof = vds.query(i)
+        assert vds.verify(pub, i, items[i], proof)
+        assert proof.payload == uncached.query(i).payload
@@ -0,0 +1,25 @@
+import random
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_append_many_matches_sequential_appends():
+    grp = PairingGroup('SS512')
+    items = [random.randbytes(16) for _ in range(40)]
+
+    v = VDSCVC(MemStore(), grp, q=4)
+    st, _ = v.setup()
+    v.append(st, items[0])
+    receipts = v.append_many(st, items[1:7])
+    assert [r.index for r in receipts] == list(range(2, 8))
+    v.append_many(st, items[7:])
+    assert st.cnt == len(items) and v.store.cvc_count() == len(items)
+    assert receipts[-1].root != st.root
+
+    for i in (1, 2, 7, 8, 23, 40):
+        assert v.verify(st, i, items[i - 1], v.query(i))
+    # batched ancestor updates leave every cached opening consistent
+    for node in v._nodes.values():
+        for j, pi in node.proofs.items():
+            assert pi == v._open(node, j)
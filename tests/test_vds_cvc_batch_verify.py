@@ -0,0 +1,31 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.common import ser
+from vds.common.types import QueryProof
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_batch_verify_reports_bad_segment():
+    grp = PairingGroup('SS512')
+    v = VDSCVC(MemStore(), grp, q=4, trusted_cache_size=0)
+    st, _ = v.setup()
+    items = {i: b"item-%d" % i for i in range(1, 41)}
+    v.append_many(st, [items[i] for i in range(1, 41)])
+
+    batch = [(i, items[i], v.query(i)) for i in (3, 17, 29, 40)]
+    assert all(r.ok for r in v.verify_batch(st, batch))
+
+    # swap the opening of the second segment of item 29 for another one
+    pld = ser.unpack(batch[2][2].payload, dict)
+    pld["segments"][1]["proof"] = pld["segments"][0]["proof"]
+    batch[2] = (29, items[29], QueryProof(scheme="cvc", index=29, payload=ser.pack(pld)))
+    batch[0] = (3, b"not item 3", batch[0][2])
+    res = v.verify_batch(st, batch)
+    assert [r.ok for r in res] == [False, True, False, True]
+    assert res[0].bad_segment == 0
+    assert res[2].bad_segment == 2
+    assert not v.verify(st, 29, items[29], batch[2][2])
+    # a single proof reports its failing level the same way
+    assert v.verify_detail(st, 29, items[29], batch[2][2]).bad_segment == 2
+    assert v.verify_detail(st, 3, b"not item 3", batch[0][2]).bad_segment == 0
+    assert v.verify_detail(st, 17, items[17], batch[1][2]).ok
@@ -0,0 +1,37 @@
+import random
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_chameleon_update_keeps_root_and_other_proofs():
+    grp = PairingGroup('SS512')
+    store = MemStore()
+    v = VDSCVC(store, grp, q=4)
+    st, _ = v.setup()
+
+    N = 20
+    items = {i: random.randbytes(16) for i in range(1, N + 1)}
+    for i in range(1, N + 1):
+        v.append(st, items[i])
+    root = st.root.value
+    old_proofs = {i: v.query(i) for i in range(1, N + 1)}
+    old_items = dict(items)
+    commits = {i: v._nodes[i].C for i in range(1, N + 1)}
+
+    for idx in (1, 3, 7, 7, N):
+        items[idx] = random.randbytes(24)
+        ur = v.update(st, idx, items[idx])
+        assert ur.root.value == root
+        assert v.verify(st, idx, items[idx], v.query(idx))
+
+    assert st.root.value == root
+    # the root is unchanged, but the replaced data no longer verifies with its old proof
+    for i in (1, 3, 7, N):
+        assert not v.verify(st, i, old_items[i], old_proofs[i])
+    assert all(v._nodes[i].C == commits[i] for i in commits)
+    for i in range(1, N + 1):
+        if i not in (1, 3, 7, N):
+            assert v.verify(st, i, items[i], old_proofs[i])
+    # stale data no longer opens the updated slot
+    assert not v.verify(st, 3, b"stale", v.query(3))
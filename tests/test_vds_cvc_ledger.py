@@ -0,0 +1,26 @@
+import random
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_cached_openings_match_fresh_openings():
+    grp = PairingGroup('SS512')
+    store = MemStore()
+    v = VDSCVC(store, grp, q=4)
+    st, _ = v.setup()
+
+    N = 24
+    items = {i: random.randbytes(16) for i in range(1, N + 1)}
+    for i in range(1, N + 1):
+        v.append(st, items[i])
+    for idx in random.sample(range(1, N + 1), 6):
+        items[idx] = random.randbytes(20)
+        v.update(st, idx, items[idx])
+
+    # every maintained π_j equals a from-scratch opening of the node's vector
+    for node in v._nodes.values():
+        for j, pi in node.proofs.items():
+            assert pi == v._open(node, j)
+    for idx in (1, 5, N):
+        assert v.verify(st, idx, items[idx], v.query(idx))
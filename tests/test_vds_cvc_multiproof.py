@@ -0,0 +1,30 @@
+import random
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.common import ser
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_multiproof_range_and_tamper():
+    grp = PairingGroup('SS512')
+    v = VDSCVC(MemStore(), grp, q=4)
+    st, _ = v.setup()
+    items = {i: random.randbytes(16) for i in range(1, 41)}
+    v.append_many(st, [items[i] for i in range(1, 41)])
+
+    rng = list(range(20, 31))
+    proof = v.query_many(rng)
+    assert proof.indices == rng
+    assert v.verify_many(st, {i: items[i] for i in rng}, proof)
+    # a subset is covered by the same proof
+    assert v.verify_many(st, {22: items[22], 30: items[30]}, proof)
+
+    pld = ser.unpack(proof.payload, dict)
+    # each ancestor and each signed h_i appears once
+    assert len(pld["nodes"]) == len({n for n, _ in pld["nodes"]})
+    assert len(pld["hs"]) <= v.q + 1
+    single = sum(len(v.query(i).payload) for i in rng)
+    assert len(proof.payload) < single
+
+    assert not v.verify_many(st, {21: b"wrong"}, proof)
+    assert not v.verify_many(st, {35: items[35]}, proof)
@@ -0,0 +1,59 @@
+from charm.toolbox.pairinggroup import PairingGroup
+from vds.common import sig
+from vds.cvc.verifier import TrustedNodeCache
+from vds.cvc.vds_cvc import VDSCVC
+from vds.storage.memstore import MemStore
+
+
+def test_trusted_nodes_short_circuit_and_reset(monkeypatch):
+    grp = PairingGroup('SS512')
+    v = VDSCVC(MemStore(), grp, q=4)
+    st, _ = v.setup()
+    items = {i: b"item-%d" % i for i in range(1, 31)}
+    v.append_many(st, [items[i] for i in range(1, 31)])
+
+    calls = []
+    real = VDSCVC._pairing_batch
+    monkeypatch.setattr(VDSCVC, "_pairing_batch", lambda self, eqs: calls.extend(eqs) or real(self, eqs))
+
+    assert v.verify(st, 25, items[25], v.query(25))
+    full = len(calls)
+    calls.clear()
+    # 24 shares parent 6 with 25: leaf + one segment, then a trusted ancestor
+    assert v.verify(st, 24, items[24], v.query(24))
+    assert len(calls) == 2 < full
+    assert not v.verify(st, 27, b"wrong", v.query(27))
+
+    # chameleon updates keep the root, so the cache stays valid
+    items[26] = b"item-26'"
+    v.update(st, 26, items[26])
+    assert v.verify(st, 26, items[26], v.query(26))
+    assert not v.verify(st, 26, b"item-26", v.query(26))
+
+    # an append moves the root and drops every trusted node
+    v.append(st, b"item-31")
+    calls.clear()
+    assert v.verify(st, 25, items[25], v.query(25))
+    assert len(calls) == full
+
+
+def test_signed_hi_memo_is_per_key_and_bounded():
+    ssk, vk = sig.keygen()
+    _, other_vk = sig.keygen()
+    cache = TrustedNodeCache(capacity=2)
+    blobs = {i: b"h-%d" % i + sig.sign(ssk, b"h-%d" % i + i.to_bytes(4, "big")) for i in range(1, 4)}
+    assert cache.check_signed_hi(vk, 1, blobs[1]) == b"h-1"
+    # a remembered pair is not accepted under another key
+    assert cache.check_signed_hi(other_vk, 1, blobs[1]) is None
+    for i in (2, 3):
+        assert cache.check_signed_hi(vk, i, blobs[i]) == b"h-%d" % i
+    assert len(cache._sigs) == 2
+
+    # a fresh setup drops what was trusted under the old keys
+    v = VDSCVC(MemStore(), PairingGroup('SS512'), q=4)
+    st, _ = v.setup()
+    v.append(st, b"x")
+    assert v.verify(st, 1, b"x", v.query(1))
+    assert len(v.trusted) and len(v.trusted._sigs)
+    v.setup()
+    assert len(v.trusted) == 0 and len(v.trusted._sigs) == 0
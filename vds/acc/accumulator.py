@@ -11,12 +11,12 @@ Public verification equation for non-membership of y ∈ ZR with witness (w ∈
     e(w, h^y · hs) == e(A · g1^(-v), h)
 """
 
-from typing import Any, List, Tuple
+from typing import Any, Iterable, List
 
 from charm.toolbox.pairinggroup import G1, G2, ZR, pair
 
 from ..common.types import ACCKey, ACCState
-from ..common.errors import StorageError
+from .poly import poly_div_linear, poly_mul_linear, subproduct_tree
 
 
 def _serialize(grp: Any, elem: Any) -> bytes:
@@ -78,6 +78,42 @@ def acc_add(grp: Any, key: ACCKey, st: ACCState, x_zr: Any) -> None:
     st.cache.append(next_power(grp, last, key.s))
 
 
+def acc_add_many(grp: Any, key: ACCKey, st: ACCState, xs: List[int]) -> List[bytes]:
+    """Add several x_i (ints mod the group order) to E with one exponentiation of A.
+
+    Mutates ACCState in-place:
+    - A <- A^{∏(x_i + s)}, the exponent is formed mod p from the trapdoor s
+    - upto += len(xs)
+    - cache gains the next len(xs) powers, which are also returned
+
+    Only st.cache[-1] is read, so callers may pass just the tail of the powers.
+    """
+    p = grp.order()
+    s = _deserialize(grp, key.s)
+    s_int = int(s)
+    exp = 1
+    for x in xs:
+        exp = exp * (x + s_int) % p
+    A = _deserialize(grp, st.value)
+    st.value = _serialize(grp, A ** grp.init(ZR, exp))
+    st.upto += len(xs)
+    last = _deserialize(grp, st.cache[-1])
+    new: List[bytes] = []
+    for _ in xs:
+        last = last ** s
+        new.append(_serialize(grp, last))
+    st.cache.extend(new)
+    return new
+
+
+def load_witness(grp: Any, w_bytes: bytes) -> Any:
+    """Deserialize a witness, mapping the serialized identity back to the identity."""
+    identity = grp.init(G1, 1)
+    if w_bytes == _serialize(grp, identity):
+        return identity
+    return _deserialize(grp, w_bytes)
+
+
 def acc_nonmem_verify(grp: Any, g1_bytes: bytes, h_bytes: bytes, hs_bytes: bytes, acc_bytes: bytes, y_zr: Any, w_bytes: bytes, v_zr: Any) -> bool:
     """Verify non-membership proof.
 
@@ -96,84 +132,27 @@ def acc_nonmem_verify(grp: Any, g1_bytes: bytes, h_bytes: bytes, hs_bytes: bytes
         return False
 
 
-# --- Product tree placeholder (for performance optimization) ---
+# --- Product (subproduct) tree over linear factors ---
 class PolyTree:
-    """A simple product tree for f(X)=∏(X+x_i).
+    """Subproduct tree for M(X)=∏(X+x_i) over integers mod p.
 
-    This placeholder stores coefficients at the root and leaves for compatibility.
-    Future optimization: compute f(-y) and Q(X) in O(U log U) with less overhead.
+    The linear leaves (X + x_i) are multiplied pairwise level by level, so
+    M(X) costs O(M(U) log U) instead of U successive linear products;
+    ``coeffs`` holds the ascending coefficients of M(X).
     """
 
-    def __init__(self, grp: Any):
-        self.grp = grp
-        self.xs: List[Any] = []  # elements in ZR
-        self.coeffs: List[Any] = [grp.init(ZR, 1)]  # ascending coeffs of f(X)
-
-    def add(self, x: Any) -> None:
-        from .accumulator import poly_mul
-
-        X_plus_x = [x, self.grp.init(ZR, 1)]
-        self.coeffs = poly_mul(self.grp, self.coeffs, X_plus_x)
-        self.xs.append(x)
-
-    def eval_and_quot(self, y: Any) -> tuple[Any, List[Any]]:
-        v = poly_eval(self.grp, self.coeffs, -y)
-        g_coeffs = self.coeffs.copy()
-        g_coeffs[0] = g_coeffs[0] - v
-        Q, rem = poly_div_linear(self.grp, g_coeffs, y)
-        if str(rem) != str(self.grp.init(ZR, 0)):
-            raise StorageError("poly division remainder non-zero")
-        return v, Q
-
-
-# Polynomial helpers over ZR
-def poly_mul(grp: Any, a: List[Any], b: List[Any]) -> List[Any]:
-    res = [grp.init(ZR, 0) for _ in range(len(a) + len(b) - 1)]
-    for i, ai in enumerate(a):
-        for j, bj in enumerate(b):
-            res[i + j] = res[i + j] + (ai * bj)
-    return res
-
-
-def poly_eval(grp: Any, coeffs: List[Any], x: Any) -> Any:
-    # Horner with ascending coeffs: coeffs[k] * x^k
-    acc = grp.init(ZR, 0)
-    pow_x = grp.init(ZR, 1)
-    for c in coeffs:
-        acc = acc + c * pow_x
-        pow_x = pow_x * x
-    return acc
+    def __init__(self, p: int, xs: Iterable[int] = ()):
+        self.p = p
+        self.xs: List[int] = [x % p for x in xs]
+        if self.xs:
+            self.coeffs: List[int] = subproduct_tree(p, self.xs)[-1][0]
+        else:
+            self.coeffs = [1]
 
+    def add(self, x: int) -> None:
+        self.coeffs = poly_mul_linear(self.p, self.coeffs, x % self.p)
+        self.xs.append(x % self.p)
 
-def poly_div_linear_desc(grp: Any, coeff_desc: List[Any], a: Any) -> Tuple[List[Any], Any]:
-    """Divide polynomial (descending coeffs) by (X - a).
-
-    Return (quotient_desc, remainder).
-    """
-    n = len(coeff_desc) - 1
-    if n < 0:
-        return [], grp.init(ZR, 0)
-    if n == 0:
-        # Constant polynomial divided by linear factor: quotient 0, remainder const
-        return [], coeff_desc[0]
-    q = [None] * n  # type: ignore[list-item]
-    q[0] = coeff_desc[0]
-    for i in range(1, n):
-        q[i] = coeff_desc[i] + a * q[i - 1]
-    r = coeff_desc[-1] + a * q[-1]
-    return q, r
-
-
-def poly_div_linear(grp: Any, coeffs: List[Any], y: Any) -> Tuple[List[Any], Any]:
-    """Divide g(X) by (X + y) i.e., (X - (-y)). coeffs are ascending.
-
-    Returns (Q_coeffs ascending, remainder).
-    """
-    if not coeffs:
-        return [], grp.init(ZR, 0)
-    # Convert to descending for synthetic division
-    desc = list(reversed(coeffs))
-    a = -y
-    q_desc, rem = poly_div_linear_desc(grp, desc, a)
-    q_asc = list(reversed(q_desc)) if q_desc else []
-    return q_asc, rem
+    def eval_and_quot(self, y: int) -> tuple[int, List[int]]:
+        Q, v = poly_div_linear(self.p, self.coeffs, y)
+        return v, Q
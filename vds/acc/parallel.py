@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+"""Process-pool witness computation for VDSACC.query_many.
+
+charm elements cannot be pickled and the multi-exponentiation
+w = ∏ powers[k]^{Q_k} holds the GIL, so a batch of proofs is spread over
+worker processes that only ever exchange bytes:
+
+- each worker builds PairingGroup(curve) once in the pool initializer and
+  keeps the powers it has deserialized, by index; a unit deserializes only
+  the records of its own index range that the worker has not seen yet
+- the powers table is published in a SharedMemory block of fixed-size
+  records (u16 length + serialized G1, zero padded) with spare capacity,
+  so growth within an epoch appends in place and the block name stays the
+  same
+- f(X) is copied packed, as the store holds it, into one SharedMemory block
+  per batch; a work unit is (block names, y_j, index range [start, stop)),
+  computes Q_j[start:stop) itself by synthetic division from the top
+  coefficient down, and returns the serialized partial product
+  ∏_{k∈[start,stop)} powers[k]^{Q_j[k]}; the unit with start = 0 also
+  returns v_j = f(-y_j), the remainder
+- the parent multiplies the partial products of each query, so it never
+  unpacks f(X) or builds a quotient
+
+The division for a range has to run down from the top coefficient, so a
+query split into c units costs about c/2 divisions of integer work in
+total; next to the group exponentiations of the same range this is small.
+Units are sized so the batch splits into about 4 per process, with at least
+``min_chunk`` terms each: many small queries go one per unit, a few large
+ones are split by index range.
+"""
+
+import math
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..common.multiexp import multiexp
+from .accumulator import load_witness
+from .poly import coeff_width
+
+_REC_LEN = struct.Struct(">H")
+MIN_CHUNK = 256
+
+# --- worker side ---
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(curve: str) -> None:
+    from charm.toolbox.pairinggroup import G1, PairingGroup
+
+    grp = PairingGroup(curve)
+    p = grp.order()
+    _worker.update(grp=grp, identity=grp.init(G1, 1), p=p, width=coeff_width(p), table=None, powers={})
+
+
+def _powers(table: Tuple[str, int, int, bytes], start: int, stop: int) -> List[Any]:
+    """Deserialized powers[start:stop), reading only records this worker has not seen."""
+    name, rec, _, lineage = table
+    if _worker["table"] != (name, rec, lineage):
+        _worker.update(table=(name, rec, lineage), powers={})
+    powers: Dict[int, Any] = _worker["powers"]
+    missing = [k for k in range(start, stop) if k not in powers]
+    if missing:
+        grp = _worker["grp"]
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            buf = shm.buf
+            for k in missing:
+                off = k * rec
+                (n,) = _REC_LEN.unpack_from(buf, off)
+                powers[k] = grp.deserialize(bytes(buf[off + 2 : off + 2 + n]))
+            del buf
+        finally:
+            shm.close()
+    return [powers[k] for k in range(start, stop)]
+
+
+def _quotient_range(f_name: str, n: int, y: int, start: int, stop: int) -> Tuple[List[int], Optional[int]]:
+    """Q[start:stop) of f(X) = Q(X)·(X + y) + v for the n-coefficient f in block f_name.
+
+    Q[n-2] = f[n-1] and Q[k-1] = f[k] - y·Q[k], so only f[start+1:n) is read.
+    v is returned when start == 0, otherwise None.
+    """
+    p, w = _worker["p"], _worker["width"]
+    shm = shared_memory.SharedMemory(name=f_name)
+    try:
+        buf = shm.buf
+        Q = [0] * (stop - start)
+        q = 0
+        for k in range(n - 1, start, -1):
+            q = (int.from_bytes(buf[k * w : (k + 1) * w], "big") - y * q) % p
+            if k - 1 < stop:
+                Q[k - 1 - start] = q
+        v = (int.from_bytes(buf[0:w], "big") - y * q) % p if start == 0 else None
+        del buf
+    finally:
+        shm.close()
+    return Q, v
+
+
+def _unit(table: Tuple[str, int, int, bytes], f_name: str, n: int, y: int, start: int, stop: int) -> Tuple[bytes, Optional[int]]:
+    """(serialized ∏_{k∈[start,stop)} powers[k]^{Q[k]}, v or None) for Q = f div (X + y)."""
+    Q, v = _quotient_range(f_name, n, y, start, stop)
+    grp = _worker["grp"]
+    w = multiexp(grp, _powers(table, start, stop), Q, _worker["identity"])
+    return grp.serialize(w), v
+
+
+# --- parent side ---
+class ParallelProver:
+    """Pool of proving processes for one curve; pass as VDSACC(..., prover=...)."""
+
+    def __init__(self, curve: str, processes: Optional[int] = None, min_chunk: int = MIN_CHUNK):
+        self.curve = curve
+        self.processes = processes or os.cpu_count() or 1
+        self.min_chunk = min_chunk
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        # published table: (shm name, record size, records written, lineage)
+        self._table: Optional[Tuple[str, int, int, bytes]] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # created after the first SharedMemory block, so workers share its resource tracker
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.curve,))
+        return self._pool
+
+    def _publish(self, table: Sequence[bytes]) -> Tuple[str, int, int, bytes]:
+        """Make powers[0..len(table)) readable by the workers; appends in place when possible."""
+        count = len(table)
+        # powers[1] = g1^s identifies the epoch: within it the table only grows
+        lineage = bytes(table[1]) if count > 1 else bytes(table[0])
+        cur = self._table
+        if cur is not None and cur[3] == lineage and cur[2] <= count:
+            name, rec, done, _ = cur
+            new = [bytes(table[k]) for k in range(done, count)]
+            if all(len(b) + 2 <= rec for b in new) and count * rec <= self._shm.size:  # type: ignore[union-attr]
+                self._write(self._shm, rec, done, new)  # type: ignore[arg-type]
+                self._table = (name, rec, count, lineage)
+                return self._table
+        recs = [bytes(b) for b in table]
+        rec = 2 + max(len(b) for b in recs)
+        shm = shared_memory.SharedMemory(create=True, size=rec * max(2 * count, 64))
+        self._write(shm, rec, 0, recs)
+        self._drop_table()
+        self._shm = shm
+        self._table = (shm.name, rec, count, lineage)
+        return self._table
+
+    @staticmethod
+    def _write(shm: shared_memory.SharedMemory, rec: int, first: int, recs: List[bytes]) -> None:
+        buf = shm.buf
+        for k, b in enumerate(recs, start=first):
+            off = k * rec
+            buf[off : off + 2] = _REC_LEN.pack(len(b))
+            buf[off + 2 : off + 2 + len(b)] = b
+        del buf
+
+    def _drop_table(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+        self._shm = None
+        self._table = None
+
+    def witnesses(self, grp: Any, table: Sequence[bytes], f_packed: bytes, ys: List[int]) -> Tuple[List[Any], List[int]]:
+        """(w_j, v_j) for f(X) = Q_j(X)·(X + y_j) + v_j and w_j = ∏_k table[k]^{Q_j[k]}.
+
+        f_packed is f(X) as pack_coeffs stores it; quotients and
+        multi-exponentiations are both computed on the pool.
+        """
+        from charm.toolbox.pairinggroup import G1
+
+        identity = grp.init(G1, 1)
+        width = coeff_width(grp.order())
+        n = len(f_packed) // width
+        deg = n - 1
+        if deg <= 0:  # f(X) constant: Q = 0, v = f
+            f0 = int.from_bytes(bytes(f_packed[:width]), "big") if n else 0
+            return [identity for _ in ys], [f0 for _ in ys]
+        pub = self._publish(table)
+        block = shared_memory.SharedMemory(create=True, size=n * width)
+        try:
+            buf = block.buf
+            buf[: n * width] = f_packed
+            del buf
+            pool = self._executor()
+            chunk = max(self.min_chunk, math.ceil(deg * len(ys) / (4 * self.processes)))
+            futures: List[Tuple[int, Any]] = []
+            for j, y in enumerate(ys):
+                for start in range(0, deg, chunk):
+                    stop = min(start + chunk, deg)
+                    futures.append((j, pool.submit(_unit, pub, block.name, n, y, start, stop)))
+            ws = [identity for _ in ys]
+            vs = [0 for _ in ys]
+            for j, fut in futures:
+                w_b, v = fut.result()
+                ws[j] = ws[j] * load_witness(grp, w_b)
+                if v is not None:
+                    vs[j] = v
+            return ws, vs
+        finally:
+            block.close()
+            block.unlink()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._drop_table()
+
+    def __enter__(self) -> "ParallelProver":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
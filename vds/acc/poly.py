@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+"""Polynomial arithmetic modulo the group order for the ACC blacklist polynomial.
+
+Conventions:
+- a polynomial is a list of Python ints in [0, p), ascending: coeffs[k]·X^k
+- ``p`` is the order of the pairing group (``grp.order()``); coefficients are
+  converted to charm ZR elements only where they meet group exponentiation
+- on the store, f(X) is a packed array of fixed-width big-endian integers
+  (see pack_coeffs / unpack_coeffs)
+
+Multiplication packs both operands into single integers (Kronecker
+substitution) and lets CPython's bignum multiply do the work; division by a
+monic polynomial switches from long division to a Newton-iteration
+reciprocal above NEWTON_CUTOFF, so a remainder tree over U points costs
+O(M(U) log U) instead of O(U^2).
+"""
+
+from typing import Iterator, List, Sequence, Tuple
+
+SCHOOLBOOK_CUTOFF = 4
+NEWTON_CUTOFF = 48
+
+
+# --- Packed representation ---
+def coeff_width(p: int) -> int:
+    """Bytes per packed coefficient for modulus p."""
+    return (p.bit_length() + 7) // 8
+
+
+def pack_coeffs(coeffs: Sequence[int], width: int) -> bytes:
+    return b"".join(c.to_bytes(width, "big") for c in coeffs)
+
+
+def unpack_coeffs(buf: bytes, width: int) -> List[int]:
+    mv = memoryview(buf)
+    return [int.from_bytes(mv[i : i + width], "big") for i in range(0, len(mv), width)]
+
+
+class CoeffView:
+    """Read-only ascending coefficient sequence over a packed buffer.
+
+    Coefficients are decoded one at a time on access, so a single pass over
+    f(X) (e.g. poly_eval) streams from the store's buffer without building a
+    list. Use unpack_coeffs when the coefficients are read more than once.
+    """
+
+    def __init__(self, buf: bytes, width: int):
+        self._mv = memoryview(buf)
+        self._width = width
+        self._n = len(self._mv) // width
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, k: int) -> int:
+        if k < 0:
+            k += self._n
+        if not 0 <= k < self._n:
+            raise IndexError(k)
+        w = self._width
+        return int.from_bytes(self._mv[k * w : (k + 1) * w], "big")
+
+    def __iter__(self) -> Iterator[int]:
+        w = self._width
+        for i in range(0, self._n * w, w):
+            yield int.from_bytes(self._mv[i : i + w], "big")
+
+    def __reversed__(self) -> Iterator[int]:
+        w = self._width
+        for i in range((self._n - 1) * w, -1, -w):
+            yield int.from_bytes(self._mv[i : i + w], "big")
+
+
+# --- Arithmetic ---
+def _school(p: int, a: Sequence[int], b: Sequence[int]) -> List[int]:
+    res = [0] * (len(a) + len(b) - 1)
+    for i, ai in enumerate(a):
+        for j, bj in enumerate(b):
+            res[i + j] += ai * bj
+    return [c % p for c in res]
+
+
+def poly_mul(p: int, a: Sequence[int], b: Sequence[int]) -> List[int]:
+    """Product a·b mod p via Kronecker substitution."""
+    if not a or not b:
+        return []
+    n = min(len(a), len(b))
+    if n <= SCHOOLBOOK_CUTOFF:
+        return _school(p, a, b)
+    # each product coefficient is a sum of n terms < p^2
+    w = (2 * p.bit_length() + n.bit_length() + 8) // 8
+    A = int.from_bytes(b"".join(c.to_bytes(w, "little") for c in a), "little")
+    B = int.from_bytes(b"".join(c.to_bytes(w, "little") for c in b), "little")
+    m = len(a) + len(b) - 1
+    buf = memoryview((A * B).to_bytes(m * w, "little"))
+    return [int.from_bytes(buf[i : i + w], "little") % p for i in range(0, m * w, w)]
+
+
+def poly_mul_linear(p: int, coeffs: List[int], y: int) -> List[int]:
+    """f(X)·(X + y) in one pass (U multiplications)."""
+    if not coeffs:
+        return []
+    res = [coeffs[0] * y % p]
+    for k in range(1, len(coeffs)):
+        res.append((coeffs[k - 1] + coeffs[k] * y) % p)
+    res.append(coeffs[-1])
+    return res
+
+
+def poly_mul_linear_packed(p: int, coeffs: Sequence[int], y: int, width: int) -> bytes:
+    """f(X)·(X + y) packed fixed-width, streamed from coeffs (e.g. a CoeffView).
+
+    Each input coefficient is decoded once and each output written once, so
+    no list of ints is built. Every coefficient of the product changes, so
+    the whole array is still rewritten.
+    """
+    n = len(coeffs)
+    if n == 0:
+        return b""
+    out = bytearray((n + 1) * width)
+    prev = 0
+    for k, c in enumerate(coeffs):
+        out[k * width : (k + 1) * width] = ((prev + c * y) % p).to_bytes(width, "big")
+        prev = c
+    out[n * width :] = prev.to_bytes(width, "big")
+    return bytes(out)
+
+
+def poly_eval(p: int, coeffs: Sequence[int], x: int) -> int:
+    """Horner evaluation of ascending coeffs at x."""
+    acc = 0
+    for c in reversed(coeffs):
+        acc = (acc * x + c) % p
+    return acc
+
+
+def poly_div_linear(p: int, coeffs: Sequence[int], y: int) -> Tuple[List[int], int]:
+    """Divide g(X) by (X + y). coeffs are ascending.
+
+    Returns (Q_coeffs ascending, remainder) with remainder = g(-y).
+    """
+    n = len(coeffs) - 1
+    if n < 0:
+        return [], 0
+    if n == 0:
+        return [], coeffs[0] % p
+    Q = [0] * n
+    q = coeffs[n] % p
+    Q[n - 1] = q
+    for k in range(n - 1, 0, -1):
+        q = (coeffs[k] - y * q) % p
+        Q[k - 1] = q
+    rem = (coeffs[0] - y * q) % p
+    return Q, rem
+
+
+def _series_inv(p: int, s: List[int], k: int) -> List[int]:
+    """Inverse of a power series with s[0] == 1, modulo X^k (Newton iteration)."""
+    g = [1]
+    prec = 1
+    while prec < k:
+        prec = min(2 * prec, k)
+        t = poly_mul(p, s[:prec], g)[:prec]
+        t = [-c % p for c in t]
+        t[0] = (t[0] + 2) % p
+        g = poly_mul(p, g, t)[:prec]
+    return g
+
+
+def poly_divmod_monic(p: int, a: List[int], m: List[int]) -> Tuple[List[int], List[int]]:
+    """Divide a(X) by a monic m(X). Returns (quotient, remainder), ascending.
+
+    The remainder always has exactly deg m coefficients.
+    """
+    d = len(m) - 1
+    if len(a) <= d:
+        return [], list(a) + [0] * (d - len(a))
+    k = len(a) - d
+    if d < NEWTON_CUTOFF or k < NEWTON_CUTOFF:
+        rem = list(a)
+        q = [0] * k
+        for i in range(len(rem) - 1, d - 1, -1):
+            c = rem[i] % p
+            q[i - d] = c
+            if not c:
+                continue
+            base = i - d
+            for j in range(d):
+                rem[base + j] -= c * m[j]
+        return q, [c % p for c in rem[:d]]
+    # rev(a) = rev(m)·rev(q) mod X^k
+    inv = _series_inv(p, m[::-1], k)
+    rq = poly_mul(p, a[::-1][:k], inv)[:k]
+    rq.extend([0] * (k - len(rq)))
+    q = rq[::-1]
+    mq = poly_mul(p, m[:d], q)
+    rem = [(a[i] - mq[i]) % p for i in range(d)]
+    return q, rem
+
+
+def poly_rem_monic(p: int, a: List[int], m: List[int]) -> List[int]:
+    """Remainder of a(X) modulo a monic m(X)."""
+    return poly_divmod_monic(p, a, m)[1]
+
+
+def subproduct_tree(p: int, xs: List[int]) -> List[List[List[int]]]:
+    """levels[0] = [(X + x_i)], levels[h+1] = pairwise products, levels[-1] = [∏(X + x_i)]."""
+    level = [[x % p, 1] for x in xs]
+    levels = [level]
+    while len(level) > 1:
+        nxt = []
+        for k in range(0, len(level) - 1, 2):
+            nxt.append(poly_mul(p, level[k], level[k + 1]))
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+        levels.append(level)
+    return levels
+
+
+def remainder_tree(p: int, levels: List[List[List[int]]], f: List[int]) -> List[int]:
+    """Push f down a subproduct tree; returns f mod (X + x_i) = f(-x_i) per leaf."""
+    if not levels or not levels[0]:
+        return []
+    rems = [poly_rem_monic(p, f, levels[-1][0])]
+    for depth in range(len(levels) - 2, -1, -1):
+        level = levels[depth]
+        nxt = []
+        for k, r in enumerate(rems):
+            left = 2 * k
+            nxt.append(poly_rem_monic(p, r, level[left]))
+            if left + 1 < len(level):
+                nxt.append(poly_rem_monic(p, r, level[left + 1]))
+        rems = nxt
+    return [r[0] for r in rems]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Tuple, List
+from typing import Any, Dict, List, Sequence, Tuple
 
 from ..common.types import (
     ACCPublic,
@@ -10,14 +10,19 @@ from ..common.types import (
 )
 from ..common.errors import VerifyError, GroupError, StorageError
 from ..common import encoding, sig, ser
-from ..common.group import hash_to_Zp
+from ..common.group import hash_to_int
+from ..common.multiexp import multiexp
 from .accumulator import (
     acc_setup,
     acc_add,
-    poly_eval,
-    poly_div_linear,
+    acc_add_many,
+    PolyTree,
     acc_nonmem_verify,
+    load_witness,
 )
+from .verifier import PreparedVerifier
+from .witness_cache import WitnessCache
+from .poly import CoeffView, poly_div_linear, poly_mul, poly_mul_linear_packed, poly_eval, coeff_width, pack_coeffs, unpack_coeffs
 from ..common.types import ACCState, ACCKey
 from vds import __version__ as VDS_VERSION
 
@@ -27,9 +32,20 @@ import msgpack
 
 
 class VDSACC:
-    def __init__(self, store: Any, grp: Any):
+    def __init__(self, store: Any, grp: Any, witness_cache_size: int = 256, prover: Any = None):
         self.store = store
         self.grp = grp
+        # optional ParallelProver (vds/acc/parallel.py) for query_many witnesses
+        self.prover = prover
+        # hot-item witnesses, carried across updates (0 disables)
+        self.witness_cache = WitnessCache(witness_cache_size)
+        # provers for retired epochs, served until cutover()
+        self._retired: Dict[int, "VDSACC"] = {}
+        # verifier precomputation for the last ACCPublic seen by verify()
+        self._verifier: PreparedVerifier | None = None
+        # f(X) is kept as ints mod the group order, packed fixed-width on the store
+        self._p = grp.order()
+        self._width = coeff_width(self._p)
 
     class _ClientState(BaseModel):
         # Signature keys
@@ -42,7 +58,6 @@ class VDSACC:
         hs: bytes  # G2
         A: bytes   # G1 current accumulator
         powers: List[bytes]  # G1 list
-        U: int
         cnt: int
         curve: str
         version: str
@@ -70,18 +85,15 @@ class VDSACC:
             gs=ser.pack({"h": self.grp.serialize(h), "hs": self.grp.serialize(hs)}),
             vk_sig=vk,
             accumulator=st.value,
+            epoch=self.store.acc_epoch(),
         )
 
         # Initialize server state
         # - accumulator value + powers cache
         self.store.set_acc_state(st.value, st.cache)
         # - polynomial f(X) = 1
-        one = self.grp.init(self.grp.ZR, 1) if hasattr(self.grp, "ZR") else None
-        # charm exposes ZR via module; use arithmetic via deserialized approach
-        from charm.toolbox.pairinggroup import ZR
-
-        one = self.grp.init(ZR, 1)
-        self.store.set_acc_poly([self.grp.serialize(one)])
+        self.store.set_acc_poly(pack_coeffs([1], self._width))
+        self.witness_cache.clear()
 
         client_state = {
             "ssk": ssk,
@@ -92,13 +104,45 @@ class VDSACC:
             "hs": self.grp.serialize(hs),
             "A": st.value,
             "powers": st.cache,
-            "U": 0,
             "cnt": 0,
             "curve": str(getattr(self.grp, 'groupType', 'MNT224')),
             "version": VDS_VERSION,
+            "epoch": self.store.acc_epoch(),
         }
         return pub, ser.pack(client_state)
 
+    def rotate(self) -> tuple[ACCPublic, bytes]:
+        """Start a fresh accumulator epoch and re-sign every live item into it.
+
+        The new epoch gets new signing keys and a new trapdoor s, with A = g1,
+        f(X) = 1 and powers = [g1, g1^s], so query cost drops back to the
+        U = 0 level. Items are streamed out of the retired epoch and re-signed
+        under the new key (no group operations). The retired epoch stays on
+        the store and can still be queried with query(idx, epoch=old) until
+        cutover(old) drops it; its proofs verify against the old ACCPublic.
+        """
+        old = self.store.begin_acc_epoch()
+        pub, st_new = self.setup()
+        state = self._load_state(st_new)
+        for data, tag, idx, sigma in old.iter_acc_items():
+            tag_new = os.urandom(16)
+            m_new = encoding.encode_item(data, tag_new, idx)
+            self.store.save_acc_item(idx, data, tag_new, sig.sign(state["ssk"], m_new))
+            state["cnt"] = idx
+        return pub, ser.pack(state)
+
+    def cutover(self, epoch: int) -> None:
+        """Drop a retired epoch; its proofs can no longer be served."""
+        self._retired.pop(epoch, None)
+        self.store.drop_acc_archive(epoch)
+
+    def _for_epoch(self, epoch: int | None) -> "VDSACC":
+        if epoch is None or epoch == self.store.acc_epoch():
+            return self
+        if epoch not in self._retired:
+            self._retired[epoch] = VDSACC(self.store.get_acc_archive(epoch), self.grp, witness_cache_size=0, prover=self.prover)
+        return self._retired[epoch]
+
     def _load_state(self, st_bytes: bytes):
         return ser.unpack(st_bytes, dict)
 
@@ -114,100 +158,212 @@ class VDSACC:
         sigma = sig.sign(state["ssk"], m)
         # Save item
         self.store.save_acc_item(idx, data, tag, sigma)
-        # Root is current accumulator
-        root = state["A"]
+        # Root is the current accumulator; state["A"] is stale after the first update
         state["cnt"] = idx
-        return AppendReceipt(index=idx, root=self._root_from_bytes(root))
+        return AppendReceipt(index=idx, root=self._root_from_bytes(self.store.get_acc_value()))
 
-    def query(self, idx: int) -> QueryProof:
-        data, tag, i, sigma = self.store.get_acc_item(idx)
-        # Build proof: compute y, v = f(-y), Q, w = g1^{Q(s)} using powers
-        f_coeff_bytes = self.store.get_acc_poly()
-        from charm.toolbox.pairinggroup import ZR, G1
-
-        coeffs = [self.grp.deserialize(b) for b in f_coeff_bytes]
-        y = hash_to_Zp(self.grp, b"ACC_SIG" + sigma)
-        v = poly_eval(self.grp, coeffs, -y)
-        g_coeffs = coeffs.copy()
-        g_coeffs[0] = g_coeffs[0] - v
-        Q, rem = poly_div_linear(self.grp, g_coeffs, y)
-        # Ensure remainder is zero
-        if str(rem) != str(self.grp.init(ZR, 0)):
-            raise StorageError("Polynomial division remainder non-zero")
-        # Build w from powers
-        acc_val, powers_bytes = self.store.get_acc_state()
-        powers = [self.grp.deserialize(b) for b in powers_bytes]
+    def query(self, idx: int, epoch: int | None = None) -> QueryProof:
+        return self.query_many([idx], epoch=epoch)[0]
+
+    def query_many(self, indices: List[int], epoch: int | None = None) -> List[QueryProof]:
+        """Build non-membership proofs for several indices in one pass.
+
+        f(X) and the powers table are deserialized once for the whole batch.
+        Each quotient Q_i has deg f coefficients of its own, so it takes one
+        synthetic division by (X + y_i), whose remainder is v_i = f(-y_i).
+        Indices with a live entry in the witness cache skip all of this.
+        ``epoch`` selects a retired epoch that has not been cut over yet.
+        """
+        if epoch is not None and epoch != self.store.acc_epoch():
+            return self._for_epoch(epoch).query_many(indices)
+        from charm.toolbox.pairinggroup import ZR
+
+        out: List[QueryProof | None] = [None] * len(indices)
+        todo = []
+        for pos, idx in enumerate(indices):
+            item = self.store.get_acc_item(idx)
+            hit = self.witness_cache.get(idx, item[3])
+            if hit is not None:
+                w, v = hit
+                out[pos] = self._proof(idx, item[3], item[1], w, self.grp.init(ZR, v))
+            else:
+                todo.append((pos, idx, item))
+        if todo:
+            packed = self.store.get_acc_poly()
+            table = self.store.acc_powers()
+            ys = [hash_to_int(b"ACC_SIG" + item[3], self._p) for _, _, item in todo]
+            if self.prover is not None:
+                # quotients and multi-exponentiations both run on the worker processes
+                if len(packed) // self._width - 1 > len(table):
+                    raise StorageError("Insufficient powers cached on server; need client to supply more.")
+                ws, vs = self.prover.witnesses(self.grp, table, packed, ys)
+                for (pos, idx, item), y, v, w in zip(todo, ys, vs, ws):
+                    out[pos] = self._witness_proof(idx, item, y, v, w)
+            else:
+                # each division streams f(X) from the store's buffer; the powers
+                # are deserialized into a list once per batch, because every
+                # multi-exponentiation window revisits all of its bases
+                coeffs = CoeffView(packed, self._width)
+                powers = [self.grp.deserialize(table[k]) for k in range(min(len(coeffs) - 1, len(table)))]
+                for (pos, idx, item), y in zip(todo, ys):
+                    out[pos] = self._prove(coeffs, powers, idx, item, y)
+        return out  # type: ignore[return-value]
+
+    def _quotient(self, coeffs: Sequence[int], y: int, n_powers: int) -> Tuple[List[int], int]:
+        # f(X) = Q(X)·(X + y) + v with v = f(-y)
+        Q, v = poly_div_linear(self._p, coeffs, y)
         # Ensure enough powers
-        if len(Q) > len(powers):
+        if len(Q) > n_powers:
             raise StorageError("Insufficient powers cached on server; need client to supply more.")
-        w = self.grp.init(G1, 1)
-        for k, qk in enumerate(Q):
-            w *= powers[k] ** qk
+        return Q, v
+
+    def _prove(self, coeffs: Sequence[int], powers: List[Any], idx: int, item: Tuple[bytes, bytes, int, bytes], y: int) -> QueryProof:
+        from charm.toolbox.pairinggroup import G1
+
+        Q, v = self._quotient(coeffs, y, len(powers))
+        w = multiexp(self.grp, powers[: len(Q)], Q, self.grp.init(G1, 1))
+        return self._witness_proof(idx, item, y, v, w)
+
+    def _witness_proof(self, idx: int, item: Tuple[bytes, bytes, int, bytes], y: int, v: int, w: Any) -> QueryProof:
+        from charm.toolbox.pairinggroup import ZR
+
+        data, tag, i, sigma = item
+        self.witness_cache.put(idx, sigma, y, w, v)
+        return self._proof(idx, sigma, tag, w, self.grp.init(ZR, v))
+
+    def _proof(self, idx: int, sigma: bytes, tag: bytes, w: Any, v_zr: Any) -> QueryProof:
         proof_payload = ser.pack({
             "sigma": sigma,
             "w": self.grp.serialize(w),
-            "u": self.grp.serialize(v),
+            "u": self.grp.serialize(v_zr),
             "tag": tag,
+            "epoch": self.store.acc_epoch(),
         })
         return QueryProof(scheme="acc", index=idx, payload=proof_payload)
 
+    def query_owner(self, st: bytes, idx: int) -> QueryProof:
+        """Owner-side proof using the trapdoor s held in the client state.
+
+        w = (A·g1^{-v})^{1/(y+s)}: two exponentiations regardless of U, instead
+        of the multi-exponentiation over U powers. v = f(-y) is still read off
+        f(X), but that is an integer Horner pass with no group operations.
+        The payload is identical to query()'s and verifies with verify().
+        """
+        from charm.toolbox.pairinggroup import ZR
+
+        state = self._load_state(st)
+        data, tag, i, sigma = self.store.get_acc_item(idx)
+        y = hash_to_int(b"ACC_SIG" + sigma, self._p)
+        v = poly_eval(self._p, CoeffView(self.store.get_acc_poly(), self._width), -y % self._p)
+        s = self.grp.deserialize(state["s"])
+        exp = s + self.grp.init(ZR, y)
+        if int(exp) == 0:
+            raise GroupError("y + s == 0; cannot build witness")
+        A = self.grp.deserialize(self.store.get_acc_value())
+        g1 = self.grp.deserialize(state["g1"])
+        v_zr = self.grp.init(ZR, v)
+        w = (A * (g1 ** (-v_zr))) ** (exp ** -1)
+        return self._proof(idx, sigma, tag, w, v_zr)
+
+    def prepare_verifier(self, pub: ACCPublic) -> PreparedVerifier:
+        """Return the PreparedVerifier for pub, rebuilding it when the root changed."""
+        if self._verifier is None or not self._verifier.matches(pub):
+            self._verifier = PreparedVerifier(self.grp, pub)
+        return self._verifier
+
     def verify(self, pub: ACCPublic, idx: int, data: bytes, proof: QueryProof) -> bool:
-        if proof.scheme != "acc":
-            raise VerifyError("Scheme mismatch in proof")
-        payload = ser.unpack(proof.payload, dict)
-        sigma = payload["sigma"]
-        w_b = payload["w"]
-        v_b = payload["u"]
-        tag = payload["tag"]
-        # Verify signature over message
-        m = encoding.encode_item(data, tag, idx)
-        if not sig.verify(pub.vk_sig, m, sigma):
-            return False
-        # Unpack public params
-        param = ser.unpack(pub.gs, dict)
-        h = self.grp.deserialize(param["h"])
-        hs = self.grp.deserialize(param["hs"])
-        y = hash_to_Zp(self.grp, b"ACC_SIG" + sigma)
-        v = self.grp.deserialize(v_b)
-        # Handle identity witness serialization quirk by normalizing w
-        from charm.toolbox.pairinggroup import G1, pair
-        id_b = self.grp.serialize(self.grp.init(G1, 1))
-        if w_b == id_b:
-            w = self.grp.init(G1, 1)
-        else:
-            w = self.grp.deserialize(w_b)
-        A = self.grp.deserialize(pub.accumulator)
-        g1 = self.grp.deserialize(pub.g)
-        lhs = pair(w, (h ** y) * hs)
-        rhs = pair(A * (g1 ** (-v)), h)
-        return lhs == rhs
+        return self.prepare_verifier(pub).verify(idx, data, proof)
+
+    def verify_many(self, pub: ACCPublic, items: List[Tuple[int, bytes, QueryProof]]) -> List[bool]:
+        """Verify many proofs against one ACCPublic; returns one bool per item.
+
+        Signatures are checked one by one (the Ed25519 backend has no batch
+        API). The pairing equations e(w_i, h^{y_i}·hs) = e(A·g1^{-v_i}, h) of
+        the survivors are raised to random 64-bit r_i and multiplied into
+
+            e(∏ w_i^{r_i y_i} · A^{-Σr_i} · g1^{Σ r_i v_i}, h) · e(∏ w_i^{r_i}, hs) == 1
+
+        i.e. two pairings and two multi-exponentiations for the whole batch.
+        If the combined check fails, the batch is bisected until the bad
+        proofs are isolated.
+        """
+        results = [False] * len(items)
+        batch: List[Tuple[int, int, Any, int]] = []  # (pos, y, w, v)
+        for pos, (idx, data, proof) in enumerate(items):
+            if proof.scheme != "acc":
+                raise VerifyError("Scheme mismatch in proof")
+            payload = ser.unpack(proof.payload, dict)
+            if payload.get("epoch", 0) != pub.epoch:
+                continue
+            sigma = payload["sigma"]
+            m = encoding.encode_item(data, payload["tag"], idx)
+            if not sig.verify(pub.vk_sig, m, sigma):
+                continue
+            y = hash_to_int(b"ACC_SIG" + sigma, self._p)
+            v = int(self.grp.deserialize(payload["u"]))
+            batch.append((pos, y, load_witness(self.grp, payload["w"]), v))
+        if not batch:
+            return results
+        pv = self.prepare_verifier(pub)
+        elems = (pv.h, pv.hs, pv.A, pv.g1)
+        pending = [batch]
+        while pending:
+            part = pending.pop()
+            if self._batch_pairing_check(elems, part):
+                for pos, _, _, _ in part:
+                    results[pos] = True
+            elif len(part) > 1:
+                mid = len(part) // 2
+                pending.append(part[:mid])
+                pending.append(part[mid:])
+        return results
+
+    def _batch_pairing_check(self, elems: Tuple[Any, Any, Any, Any], part: List[Tuple[int, int, Any, int]]) -> bool:
+        import secrets
+        from charm.toolbox.pairinggroup import G1, GT, pair
+
+        h, hs, A, g1 = elems
+        p = self._p
+        rs = [secrets.randbits(64) | 1 for _ in part]
+        ws = [w for _, _, w, _ in part]
+        r_sum = sum(rs) % p
+        rv_sum = sum(r * v for r, (_, _, _, v) in zip(rs, part)) % p
+        identity = self.grp.init(G1, 1)
+        X = multiexp(
+            self.grp,
+            ws + [A, g1],
+            [r * y % p for r, (_, y, _, _) in zip(rs, part)] + [-r_sum % p, rv_sum],
+            identity,
+        )
+        Y = multiexp(self.grp, ws, rs, identity)
+        return pair(X, h) * pair(Y, hs) == self.grp.init(GT, 1)
 
     def update(self, st: bytes, idx: int, new_data: bytes) -> UpdateReceipt:
         state = self._load_state(st)
         # Fetch old item
         data_old, tag_old, i, sigma_old = self.store.get_acc_item(idx)
         # Add x = H_zr(σ_old) to blacklist and update accumulator client-side
-        y = hash_to_Zp(self.grp, b"ACC_SIG" + sigma_old)
-        tmp_st = ACCState(value=state["A"], upto=state["U"], cache=list(state["powers"]))
-        acc_add(self.grp, ACCKey(s=state["s"], g=state["g1"], gs=state["hs"]), tmp_st, y)
-        # write back
-        state["A"] = tmp_st.value
-        state["U"] = tmp_st.upto
-        state["powers"] = tmp_st.cache
-        # Extend server-side polynomial f(X) = f(X) * (X + y)
-        coeff_bytes = self.store.get_acc_poly()
-        coeffs = [self.grp.deserialize(b) for b in coeff_bytes]
+        y = hash_to_int(b"ACC_SIG" + sigma_old, self._p)
         from charm.toolbox.pairinggroup import ZR
 
-        new_coeffs = []
-        x_poly = [y, self.grp.init(ZR, 1)]  # (X + y) ascending
-        # poly_mul
-        from .accumulator import poly_mul
-
-        new_coeffs = poly_mul(self.grp, coeffs, x_poly)
-        self.store.set_acc_poly([self.grp.serialize(c) for c in new_coeffs])
-        # Update server acc state value and powers cache from client
-        self.store.set_acc_state(state["A"], state["powers"])
+        # Start from the current accumulator on the store: `st` is immutable bytes,
+        # so its A/powers are only current until the first update. acc_add only
+        # reads the last power, so the table itself is not loaded; the table
+        # holds U + 2 powers after U additions.
+        acc_val = self.store.get_acc_value()
+        powers = self.store.acc_powers()
+        tmp_st = ACCState(value=acc_val, upto=len(powers) - 2, cache=[powers[-1]])
+        # carry cached witnesses of the other items across the addition of y
+        self.witness_cache.discard(idx)
+        if len(self.witness_cache):
+            self.witness_cache.advance(self.grp.deserialize(acc_val), y, self._p)
+        acc_add(self.grp, ACCKey(s=state["s"], g=state["g1"], gs=state["hs"]), tmp_st, self.grp.init(ZR, y))
+        # Extend server-side polynomial f(X) = f(X) * (X + y)
+        coeffs = CoeffView(self.store.get_acc_poly(), self._width)
+        self.store.set_acc_poly(poly_mul_linear_packed(self._p, coeffs, y, self._width))
+        # New accumulator value; the powers table grows by one in place
+        self.store.set_acc_value(tmp_st.value)
+        self.store.append_powers(tmp_st.cache[1:])
         # Now replace the item with new data, new tag and signature
         idx_new = idx
         tag_new = os.urandom(16)
@@ -215,7 +371,41 @@ class VDSACC:
         sigma_new = sig.sign(state["ssk"], m_new)
         self.store.save_acc_item(idx_new, new_data, tag_new, sigma_new)
         # Root becomes new accumulator value
-        return UpdateReceipt(index=idx, root=self._root_from_bytes(state["A"]))
+        return UpdateReceipt(index=idx, root=self._root_from_bytes(tmp_st.value))
+
+    def update_many(self, st: bytes, updates: Dict[int, bytes]) -> List[UpdateReceipt]:
+        """Replace several items at once.
+
+        All old signatures go onto the blacklist together: f(X) is multiplied
+        by P(X) = ∏(X + y_i) built with a product tree, A advances with a
+        single exponentiation by P(s), the powers table grows by len(updates)
+        in one append, and every item is re-signed in one pass. Cached
+        witnesses are dropped (moving them across several additions needs
+        the intermediate accumulators).
+        """
+        if not updates:
+            return []
+        state = self._load_state(st)
+        indices = list(updates)
+        ys = [hash_to_int(b"ACC_SIG" + self.store.get_acc_item(i)[3], self._p) for i in indices]
+        powers = self.store.acc_powers()
+        # only the last power is needed to extend the table
+        tmp_st = ACCState(value=self.store.get_acc_value(), upto=len(powers) - 2, cache=[powers[-1]])
+        new_powers = acc_add_many(self.grp, ACCKey(s=state["s"], g=state["g1"], gs=state["hs"]), tmp_st, ys)
+        # f(X) <- f(X) · ∏(X + y_i)
+        P = PolyTree(self._p, ys).coeffs
+        coeffs = unpack_coeffs(self.store.get_acc_poly(), self._width)
+        self.store.set_acc_poly(pack_coeffs(poly_mul(self._p, coeffs, P), self._width))
+        self.store.set_acc_value(tmp_st.value)
+        self.store.append_powers(new_powers)
+        self.witness_cache.clear()
+        # re-sign all replaced items
+        for idx in indices:
+            tag_new = os.urandom(16)
+            m_new = encoding.encode_item(updates[idx], tag_new, idx)
+            self.store.save_acc_item(idx, updates[idx], tag_new, sig.sign(state["ssk"], m_new))
+        root = self._root_from_bytes(tmp_st.value)
+        return [UpdateReceipt(index=idx, root=root) for idx in indices]
 
     def _root_from_bytes(self, b: bytes):
         from ..common.types import RootDigest
@@ -226,6 +416,10 @@ class VDSACC:
     def export_state(self, st: bytes) -> bytes:
         """Export client state including accumulator value, powers, f_coeffs, U.
 
+        U (the number of additions) is read off the store's powers table, which
+        holds U + 2 entries; import_state ignores it for the same reason.
+
+        f_coeffs is the packed fixed-width array held by the store.
         Returned as msgpack with version and curve for compatibility.
         """
         state = self._load_state(st)
@@ -237,8 +431,9 @@ class VDSACC:
             "accumulator": acc_val,
             "powers": powers,
             "f_coeffs": coeffs,
-            "U": state.get("U", 0),
+            "U": len(powers) - 2,
             "cnt": state.get("cnt", 0),
+            "epoch": self.store.acc_epoch(),
         }
         return ser.pack(payload)
 
@@ -254,6 +449,7 @@ class VDSACC:
         # curve check is best-effort metadata
         self.store.set_acc_state(data["accumulator"], data["powers"])  # type: ignore[index]
         self.store.set_acc_poly(data["f_coeffs"])  # type: ignore[index]
-        state["U"] = data.get("U", state.get("U", 0))
+        self.store.set_acc_epoch(data.get("epoch", 0))
+        self.witness_cache.clear()
         state["cnt"] = data.get("cnt", state.get("cnt", 0))
         return ser.pack(state)
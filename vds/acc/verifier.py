@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+"""Verifier-side precomputation for a fixed ACC root.
+
+For one ACCPublic the right-hand side of the non-membership equation only
+depends on v:
+
+    e(A·g1^{-v}, h) = e(A, h) · e(g1, h)^{-v}
+
+so e(A, h) and e(g1, h) are computed once and each proof costs one pairing
+e(w, h^y·hs) plus one GT exponentiation. h and e(g1, h) get charm's fixed-base
+tables (initPP) since they are raised to a fresh exponent on every call.
+"""
+
+from typing import Any, Tuple
+
+from charm.toolbox.pairinggroup import pair
+
+from ..common import encoding, ser, sig
+from ..common.errors import VerifyError
+from ..common.group import hash_to_Zp
+from ..common.types import ACCPublic, QueryProof
+from .accumulator import load_witness
+
+
+def _init_pp(elem: Any) -> None:
+    try:
+        elem.initPP()
+    except Exception:  # pragma: no cover - plain exponentiation still works
+        pass
+
+
+class PreparedVerifier:
+    """Deserialized public parameters and GT constants for one accumulator root."""
+
+    def __init__(self, grp: Any, pub: ACCPublic):
+        self.grp = grp
+        self._key = self._pub_key(pub)
+        self.epoch = pub.epoch
+        self.vk_sig = pub.vk_sig
+        param = ser.unpack(pub.gs, dict)
+        self.h = grp.deserialize(param["h"])
+        self.hs = grp.deserialize(param["hs"])
+        self.A = grp.deserialize(pub.accumulator)
+        self.g1 = grp.deserialize(pub.g)
+        self.e_Ah = pair(self.A, self.h)
+        self.e_gh = pair(self.g1, self.h)
+        _init_pp(self.h)
+        _init_pp(self.e_gh)
+
+    @staticmethod
+    def _pub_key(pub: ACCPublic) -> Tuple[bytes, bytes, bytes, bytes, int]:
+        return (pub.g, pub.gs, pub.vk_sig, pub.accumulator, pub.epoch)
+
+    def matches(self, pub: ACCPublic) -> bool:
+        """False once the accumulator (or any other public value) has changed."""
+        return self._pub_key(pub) == self._key
+
+    def verify(self, idx: int, data: bytes, proof: QueryProof) -> bool:
+        if proof.scheme != "acc":
+            raise VerifyError("Scheme mismatch in proof")
+        payload = ser.unpack(proof.payload, dict)
+        sigma = payload["sigma"]
+        if payload.get("epoch", 0) != self.epoch:
+            return False
+        m = encoding.encode_item(data, payload["tag"], idx)
+        if not sig.verify(self.vk_sig, m, sigma):
+            return False
+        y = hash_to_Zp(self.grp, b"ACC_SIG" + sigma)
+        v = self.grp.deserialize(payload["u"])
+        w = load_witness(self.grp, payload["w"])
+        lhs = pair(w, (self.h ** y) * self.hs)
+        rhs = self.e_Ah * (self.e_gh ** (-v))
+        return lhs == rhs
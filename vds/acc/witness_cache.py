@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+"""Server-side cache of ACC non-membership witnesses.
+
+An entry (w, v) for y satisfies f(X) = Q(X)·(X + y) + v with w = g1^{Q(s)}.
+When x is added to the blacklist (f' = f·(X + x), A' = A^{x+s}) the witness
+can be moved forward without the trapdoor and without touching f(X):
+
+    Q'(X) = Q(X)·(X + x) + v
+    w'    = A · w^{x - y}        (A = accumulator *before* the addition)
+    v'    = v · (x - y)
+
+so each cached entry costs one exponentiation per update instead of a full
+polynomial pass plus a U-term multi-exponentiation per query.
+"""
+
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class WitnessCache:
+    """Bounded LRU map idx -> (sigma, y, w, v).
+
+    sigma identifies the signed item the witness was built for; a lookup with
+    a different sigma (the item was re-signed by an update) is a miss.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self._entries: "OrderedDict[int, Tuple[bytes, int, Any, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, idx: int, sigma: bytes) -> Optional[Tuple[Any, int]]:
+        ent = self._entries.get(idx)
+        if ent is None or ent[0] != sigma:
+            return None
+        self._entries.move_to_end(idx)
+        return ent[2], ent[3]
+
+    def put(self, idx: int, sigma: bytes, y: int, w: Any, v: int) -> None:
+        if self.capacity <= 0:
+            return
+        self._entries[idx] = (sigma, y, w, v)
+        self._entries.move_to_end(idx)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def discard(self, idx: int) -> None:
+        self._entries.pop(idx, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def advance(self, A_old: Any, x: int, p: int) -> None:
+        """Move every cached witness across the addition of x to the blacklist."""
+        for idx, (sigma, y, w, v) in list(self._entries.items()):
+            d = (x - y) % p
+            self._entries[idx] = (sigma, y, A_old * (w ** d), v * d % p)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+"""asyncio front-end over VDSACC / VDSCVC with request coalescing.
+
+Queries that arrive within ``window`` seconds of each other are answered by
+one batched computation: VDSACC.query_many loads f(X) and the powers table
+once for the whole batch, and repeated indices are proved once.
+Verifications are coalesced the same way into VDSACC.verify_many /
+VDSCVC.verify_batch (one combined pairing check per batch), grouped by the
+ACCPublic / client state they verify against.
+
+All group arithmetic runs on an executor, so the event loop only queues
+requests and resolves futures. The default executor has one worker: the
+scheme objects and their stores are not thread-safe, and a single worker
+also keeps appends and updates in submission order with respect to the
+batches. A query is answered from the state at the moment its batch runs.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..acc.vds_acc import VDSACC
+from ..common.types import AppendReceipt, QueryProof, UpdateReceipt
+
+
+class CoalescingService:
+    def __init__(self, vds: Any, window: float = 0.002, max_batch: int = 256, executor: Optional[Executor] = None):
+        self.vds = vds
+        self.window = window
+        self.max_batch = max_batch
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="vds")
+        self._queries: List[Tuple[int, asyncio.Future]] = []
+        self._verifies: List[Tuple[Any, int, bytes, QueryProof, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        # batches run / requests answered, for tuning window and max_batch
+        self.stats = {"batches": 0, "queries": 0, "verifies": 0}
+
+    # --- coalesced requests ---
+    async def query(self, idx: int) -> QueryProof:
+        fut = asyncio.get_running_loop().create_future()
+        self._queries.append((idx, fut))
+        self._schedule(len(self._queries))
+        return await fut
+
+    async def verify(self, who: Any, idx: int, data: bytes, proof: QueryProof) -> bool:
+        """who is the ACCPublic (ACC) or the client state (CVC) to verify against."""
+        fut = asyncio.get_running_loop().create_future()
+        self._verifies.append((who, idx, data, proof, fut))
+        self._schedule(len(self._verifies))
+        return await fut
+
+    # --- mutations: not coalesced, but off the event loop ---
+    async def append(self, st: Any, data: bytes) -> AppendReceipt:
+        return await self._run(self.vds.append, st, data)
+
+    async def update(self, st: Any, idx: int, data: bytes) -> UpdateReceipt:
+        return await self._run(self.vds.update, st, idx, data)
+
+    async def _run(self, fn: Any, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # --- batching ---
+    def _schedule(self, queued: int) -> None:
+        if queued >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queries, self._queries = self._queries, []
+        verifies, self._verifies = self._verifies, []
+        if queries or verifies:
+            task = asyncio.get_running_loop().create_task(self._run_batch(queries, verifies))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, queries: List[Tuple[int, asyncio.Future]], verifies: list) -> None:
+        try:
+            await self._answer(queries, verifies)
+        except Exception as e:  # executor failure: nobody may be left waiting
+            for fut in [q[1] for q in queries] + [v[4] for v in verifies]:
+                _settle(fut, e)
+
+    async def _answer(self, queries: List[Tuple[int, asyncio.Future]], verifies: list) -> None:
+        self.stats["batches"] += 1
+        if queries:
+            indices = list(dict.fromkeys(idx for idx, _ in queries))
+            results = await self._run(self._query_batch, indices)
+            for idx, fut in queries:
+                _settle(fut, results[idx])
+            self.stats["queries"] += len(queries)
+        if verifies:
+            groups: Dict[int, list] = {}
+            for v in verifies:
+                groups.setdefault(id(v[0]), []).append(v)
+            for group in groups.values():
+                oks = await self._run(self._verify_batch, group[0][0], [(i, d, p) for _, i, d, p, _ in group])
+                for (_, _, _, _, fut), ok in zip(group, oks):
+                    _settle(fut, ok)
+            self.stats["verifies"] += len(verifies)
+
+    def _query_batch(self, indices: List[int]) -> Dict[int, Any]:
+        """idx -> QueryProof or the exception raised for that index (executor side)."""
+        if isinstance(self.vds, VDSACC):
+            try:
+                return dict(zip(indices, self.vds.query_many(indices)))
+            except Exception as e:
+                if len(indices) == 1:
+                    return {indices[0]: e}
+                # one bad index fails query_many; isolate it so the rest still get proofs
+        out: Dict[int, Any] = {}
+        for idx in indices:
+            try:
+                out[idx] = self.vds.query(idx)
+            except Exception as e:
+                out[idx] = e
+        return out
+
+    def _verify_batch(self, who: Any, items: List[Tuple[int, bytes, QueryProof]]) -> List[Any]:
+        """ok or the exception raised for each item (executor side)."""
+        try:
+            if isinstance(self.vds, VDSACC):
+                return list(self.vds.verify_many(who, items))
+            return [r.ok for r in self.vds.verify_batch(who, items)]
+        except Exception as e:
+            if len(items) == 1:
+                return [e]
+            # a malformed proof fails the whole batch; check each on its own
+        out: List[Any] = []
+        for idx, data, proof in items:
+            try:
+                out.append(self.vds.verify(who, idx, data, proof))
+            except Exception as e:
+                out.append(e)
+        return out
+
+    async def close(self) -> None:
+        """Answer everything still queued, then release the executor if it is ours."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+
+
+def _settle(fut: asyncio.Future, result: Any) -> None:
+    if fut.done():  # caller was cancelled
+        return
+    if isinstance(result, Exception):
+        fut.set_exception(result)
+    else:
+        fut.set_result(result)
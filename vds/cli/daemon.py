@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+"""Long-running server behind `vds_cli serve`.
+
+The daemon opens one state file (as written by `vds_cli init`) once: the
+pairing group, the VDSACC/VDSCVC instance, its FileStore and, for CVC, the
+mmap'ed parameter bundle stay in memory across requests. Requests arrive on
+a Unix domain socket in the framing of vds.cli.protocol and are executed one
+at a time under a lock; each connection has its own thread, so an idle
+client does not hold up the others. After a mutating request only the small
+state file (roots, counters) is rewritten; the store persists itself.
+
+The socket is created owner-only (0600); there is no other authentication,
+so whoever can connect can mutate the store. A socket path that a live
+daemon still answers on is never taken over, only a stale one is replaced.
+The ``shutdown`` op is refused unless the daemon was started with
+allow_shutdown; otherwise it is stopped by a signal.
+"""
+
+import os
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import msgpack
+from charm.toolbox.pairinggroup import PairingGroup
+
+from ..acc.vds_acc import VDSACC
+from ..common.errors import StorageError
+from ..common.types import ACCPublic, CVCParamsPK, CVCParamsSK, QueryProof, RootDigest
+from ..cvc.vds_cvc import CVCClientState, VDSCVC
+from ..storage.filestore import FileStore
+from .protocol import recv_msg, send_msg
+
+
+class Session:
+    """A loaded state file plus the scheme objects serving it."""
+
+    def __init__(self, state_path: str) -> None:
+        self.path = Path(state_path)
+        self.state: Dict[str, Any] = msgpack.unpackb(self.path.read_bytes(), raw=False)
+        self.scheme = self.state.get("scheme")
+        base = self.path.parent
+        if self.scheme == "acc" and "data" in self.state:
+            self.grp = PairingGroup(self.state["curve"])
+            self.store = FileStore(str(base / self.state["data"]))
+            self.vds: Any = VDSACC(self.store, self.grp)
+            self.pub = ACCPublic(**self.state["pub"])
+            self.st: Any = self.state["client_state"]
+        elif self.scheme == "cvc" and "nodes" in self.state:
+            self.grp = PairingGroup("SS512")
+            cs = self.state["client_state"]
+            self.store = FileStore(str(base / self.state["nodes"]))
+            self.vds = VDSCVC(self.store, self.grp, q=int(self.state.get("q", 64)))
+            sk = CVCParamsSK(**cs["sk"])
+            self.vds.setup(params_path=str(base / self.state["params"]), sk=sk)
+            versions = {int(k): int(v) for k, v in cs.get("versions", {}).items()}
+            self.st = CVCClientState(CVCParamsPK(**cs["pk"]), sk, RootDigest(**cs["root"]), int(cs["cnt"]), versions)
+        else:
+            raise StorageError("serve needs a state file from the current init (FileStore-backed)")
+        self._ops: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "ping": lambda req: {"scheme": self.scheme},
+            "append": self.append,
+            "query": self.query,
+            "verify": self.verify,
+            "update": self.update,
+        }
+
+    def handle(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        op = self._ops.get(req.get("op", ""))
+        if op is None:
+            raise StorageError(f"unknown op {req.get('op')!r}")
+        if req.get("scheme", self.scheme) != self.scheme:
+            raise StorageError(f"daemon serves {self.scheme}, not {req['scheme']}")
+        return op(req)
+
+    def _save(self) -> None:
+        if self.scheme == "acc":
+            self.state["pub"]["accumulator"] = self.pub.accumulator
+        else:
+            self.state["client_state"]["root"] = self.st.root.model_dump()
+            self.state["client_state"]["cnt"] = self.st.cnt
+            self.state["client_state"]["versions"] = {str(k): v for k, v in self.st.versions.items()}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(msgpack.packb(self.state, use_bin_type=True))
+        os.replace(tmp, self.path)
+
+    def append(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        rec = self.vds.append(self.st, req["data"])
+        if self.scheme == "acc":
+            self.pub.accumulator = rec.root.value
+        self._save()
+        return {"index": rec.index, "root": rec.root.value}
+
+    def query(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        return {"proof": self.vds.query(int(req["index"])).payload}
+
+    def verify(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        idx = int(req["index"])
+        pr = QueryProof(scheme=self.scheme, index=idx, payload=req["proof"])
+        who = self.pub if self.scheme == "acc" else self.st
+        return {"ok": bool(self.vds.verify(who, idx, req["data"], pr))}
+
+    def update(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        rec = self.vds.update(self.st, int(req["index"]), req["data"])
+        if self.scheme == "acc":
+            self.pub.accumulator = rec.root.value
+        self._save()
+        return {"index": rec.index, "root": rec.root.value}
+
+    def close(self) -> None:
+        if self.scheme == "cvc" and self.vds.params is not None:
+            self.vds.params.close()
+        self.store.close()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "Daemon"
+
+    def handle(self) -> None:
+        while True:
+            try:
+                req = recv_msg(self.request)
+            except Exception:  # malformed frame: drop the connection
+                return
+            if req is None:
+                return
+            if req.get("op") == "shutdown":
+                if not self.server.allow_shutdown:
+                    send_msg(self.request, {"ok": False, "error": "shutdown over the socket is disabled"})
+                    continue
+                send_msg(self.request, {"ok": True, "result": {}})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            try:
+                with self.server.lock:
+                    result = self.server.session.handle(req)
+                reply = {"ok": True, "result": result}
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            send_msg(self.request, reply)
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, session: Session, socket_path: str, allow_shutdown: bool = False) -> None:
+        _claim_socket_path(socket_path)
+        self.session = session
+        self.socket_path = socket_path
+        self.allow_shutdown = allow_shutdown
+        self.lock = threading.Lock()
+        super().__init__(socket_path, _Handler)
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.session.close()
+
+
+def _claim_socket_path(path: str) -> None:
+    """Remove a stale socket at path; refuse if a daemon answers there or it is not a socket."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise StorageError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:  # nobody listening: left over from a daemon that died
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise StorageError(f"a daemon is already serving {path}")
+
+
+def serve(state_path: str, socket_path: str, ready: Callable[[], None] | None = None, allow_shutdown: bool = False) -> None:
+    """Serve state_path on socket_path until a shutdown request (if allowed) or a signal."""
+    session = Session(state_path)
+    try:
+        d = Daemon(session, socket_path, allow_shutdown)
+    except Exception:
+        session.close()
+        raise
+    with d:
+        if ready is not None:
+            ready()
+        d.serve_forever()
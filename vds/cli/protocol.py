@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+"""Wire format between vds_cli --connect and the serve daemon.
+
+Every message is one frame: a u32 big-endian length followed by that many
+bytes of msgpack. A request is a map {"op": str, ...arguments}; the reply is
+{"ok": True, "result": {...}} or {"ok": False, "error": str}. Payloads
+(data, proofs) travel as raw msgpack bin, with no hex or JSON step.
+"""
+
+import socket
+import struct
+from typing import Any, Dict, Optional
+
+import msgpack
+
+from ..common.errors import DecodeError, StorageError
+
+_LEN = struct.Struct(">I")
+MAX_FRAME = 64 << 20
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            if buf:
+                raise DecodeError("connection closed inside a frame")
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def send_msg(sock: socket.socket, obj: Dict[str, Any]) -> None:
+    data = msgpack.packb(obj, use_bin_type=True)
+    if len(data) > MAX_FRAME:
+        raise DecodeError(f"frame of {len(data)} bytes exceeds {MAX_FRAME}")
+    sock.sendall(_LEN.pack(len(data)) + data)
+
+
+def recv_msg(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Next message, or None when the peer closed the connection between frames."""
+    head = _recv_exact(sock, _LEN.size)
+    if head is None:
+        return None
+    (n,) = _LEN.unpack(head)
+    if n > MAX_FRAME:
+        raise DecodeError(f"frame of {n} bytes exceeds {MAX_FRAME}")
+    body = _recv_exact(sock, n)
+    if body is None:
+        raise DecodeError("connection closed inside a frame")
+    obj = msgpack.unpackb(body, raw=False)
+    if not isinstance(obj, dict):
+        raise DecodeError("frame is not a map")
+    return obj
+
+
+class Client:
+    """One connection to a serve daemon; requests are answered in order."""
+
+    def __init__(self, path: str) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(path)
+        except OSError as e:
+            self._sock.close()
+            raise StorageError(f"cannot connect to {path}: {e}") from e
+
+    def call(self, op: str, **args: Any) -> Dict[str, Any]:
+        send_msg(self._sock, {"op": op, **args})
+        reply = recv_msg(self._sock)
+        if reply is None:
+            raise StorageError("daemon closed the connection")
+        if not reply.get("ok"):
+            raise StorageError(reply.get("error", "request failed"))
+        return reply["result"]
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
 import sys
 import time
 from pathlib import Path
@@ -13,9 +14,11 @@ from charm.toolbox.pairinggroup import PairingGroup
 
 from ..acc.vds_acc import VDSACC
 from ..cvc.vds_cvc import VDSCVC
+from ..storage.filestore import FileStore
 from ..storage.memstore import MemStore
-from ..common.types import ACCPublic, QueryProof, AppendReceipt, UpdateReceipt, RootDigest
+from ..common.types import ACCPublic, CVCParamsSK, QueryProof, AppendReceipt, UpdateReceipt, RootDigest
 from ..common import ser
+from .protocol import Client
 
 
 def _read_data_arg(arg: str) -> bytes:
@@ -58,31 +61,38 @@ def init(scheme: str, curve: str, q_branch: int, store: str) -> None:
     path = Path(store)
     grp = PairingGroup(curve if scheme == "acc" else "SS512")
     if scheme == "acc":
-        mem = MemStore()
-        vds = VDSACC(mem, grp)
-        pub, st = vds.setup()
-        acc_v, acc_powers = mem.get_acc_state()
+        data_path = _acc_data_path(path)
+        if data_path.exists():
+            shutil.rmtree(data_path)
+        with FileStore(str(data_path)) as fs:
+            vds = VDSACC(fs, grp)
+            pub, st = vds.setup()
         state = {
             "scheme": "acc",
             "curve": curve,
             "pub": pub.model_dump(),
             "client_state": st,
-            "store": {
-                "acc_value": acc_v,
-                "acc_cache": acc_powers,
-                "f_coeffs": mem.get_acc_poly(),
-                "items": {},
-            },
+            "data": data_path.name,
         }
         _save_state(path, state)
     else:
-        mem = MemStore()
-        vds = VDSCVC(mem, grp, q=q_branch)
-        st, _ = vds.setup()
+        params_path = _cvc_params_path(path)
+        nodes_path = _cvc_nodes_path(path)
+        if params_path.exists():
+            params_path.unlink()
+        if nodes_path.exists():
+            shutil.rmtree(nodes_path)
+        fs = FileStore(str(nodes_path))
+        vds = VDSCVC(fs, grp, q=q_branch)
+        st, _ = vds.setup(params_path=str(params_path))
+        vds.params.close()  # type: ignore[union-attr]
+        fs.close()
         state = {
             "scheme": "cvc",
             "curve": "SS512",
             "q": q_branch,
+            "params": params_path.name,
+            "nodes": nodes_path.name,
             "client_state": {
                 "pk": st.pk.model_dump(),
                 "sk": st.sk.model_dump(),
@@ -95,56 +105,110 @@ def init(scheme: str, curve: str, q_branch: int, store: str) -> None:
     click.echo(json.dumps({"ok": True, "scheme": scheme, "curve": curve, "store": store, "ms": int((time.perf_counter()-t0)*1000)}))
 
 
-def _restore_acc(path: Path) -> Tuple[VDSACC, MemStore, ACCPublic, bytes, Dict[str, Any]]:
+def _acc_data_path(path: Path) -> Path:
+    return path.with_name(path.name + ".data")
+
+
+def _restore_acc(path: Path) -> Tuple[VDSACC, Any, ACCPublic, bytes, Dict[str, Any]]:
     obj = _load_state(path)
     assert obj.get("scheme") == "acc"
     grp = PairingGroup(obj["curve"])  # type: ignore[index]
+    pub = ACCPublic(**obj["pub"])  # type: ignore[arg-type]
+    st = obj["client_state"]  # type: ignore[index]
+    if "data" in obj:
+        # 条目日志 + 定宽偏移索引：按需读取单条，不整体加载
+        fs = FileStore(str(path.parent / obj["data"]))
+        return VDSACC(fs, grp), fs, pub, st, obj
     mem = MemStore()
     mem.set_acc_state(obj["store"]["acc_value"], obj["store"]["acc_cache"])  # type: ignore[index]
     mem.set_acc_poly(obj["store"]["f_coeffs"])  # type: ignore[index]
     for k, v in obj["store"]["items"].items():  # type: ignore[index]
         mem.save_acc_item(int(k), v[0], v[1], v[3])
-    vds = VDSACC(mem, grp)
-    pub = ACCPublic(**obj["pub"])  # type: ignore[arg-type]
-    st = obj["client_state"]  # type: ignore[index]
-    return vds, mem, pub, st, obj
+    return VDSACC(mem, grp), mem, pub, st, obj
+
+
+def _close(store: Any) -> None:
+    if isinstance(store, FileStore):
+        store.close()
+
+
+def _store_path(store: Optional[str]) -> Path:
+    if not store:
+        raise click.UsageError("--store or --connect is required")
+    return Path(store)
+
+
+def _remote(sock: str, op: str, **args: Any) -> Dict[str, Any]:
+    with Client(sock) as c:
+        return c.call(op, **args)
+
+
+def _cvc_params_path(path: Path) -> Path:
+    return path.with_name(path.name + ".params")
 
 
-def _restore_cvc(path: Path) -> Tuple[VDSCVC, MemStore, Dict[str, Any]]:
+def _cvc_nodes_path(path: Path) -> Path:
+    return path.with_name(path.name + ".nodes")
+
+
+def _cvc_versions(state: Dict[str, Any]) -> Dict[int, int]:
+    # 变色龙更新不改根：每个已更新条目的版本号绑定进叶值，旧 (data, proof) 因此失效
+    return {int(k): int(v) for k, v in state["client_state"].get("versions", {}).items()}
+
+
+def _restore_cvc(path: Path) -> Tuple[VDSCVC, Any, Dict[str, Any]]:
     obj = _load_state(path)
     assert obj.get("scheme") == "cvc"
     grp = PairingGroup("SS512")
+    sk = CVCParamsSK(**obj["client_state"]["sk"])  # type: ignore[arg-type]
+    if "nodes" in obj:
+        # 参数包（mmap，h_{i,j} 行按需计算并回写）+ 持久化节点：只读写路径上的 O(log_q n) 个节点
+        fs = FileStore(str(path.parent / obj["nodes"]))
+        vds = VDSCVC(fs, grp, q=int(obj.get("q", 64)))
+        vds.setup(params_path=str(path.parent / obj["params"]), sk=sk)
+        return vds, fs, obj
     mem = MemStore()
     vds = VDSCVC(mem, grp, q=int(obj.get("q", 64)))
-    # 通过重放 items 重建状态
-    st, _ = vds.setup()
-    # 覆盖 sk/pk 以一致（PRF 决定 r）
-    st.pk = type(st.pk)(**obj["client_state"]["pk"])  # type: ignore
-    st.sk = type(st.sk)(**obj["client_state"]["sk"])  # type: ignore
-    st.cnt = 0
-    st.root = RootDigest(value=st.root.value)
+    if "params" in obj:
+        st, _ = vds.setup(params_path=str(path.parent / obj["params"]), sk=sk)
+    else:
+        st, _ = vds.setup()
     # 重放 append
     for idx_str in sorted(obj["items"].keys(), key=lambda x: int(x)):  # type: ignore[index]
         data = obj["items"][idx_str]  # type: ignore[index]
         vds.append(st, data)
+    # 重放变色龙更新（按记录顺序；与本次 setup 的陷门一致）
+    for idx, data in obj.get("updates", []):
+        vds.update(st, int(idx), data)
+    if "params" not in obj:
+        # 旧状态文件无参数包：沿用记录的 pk/sk
+        st.pk = type(st.pk)(**obj["client_state"]["pk"])  # type: ignore
+        st.sk = sk
     return vds, mem, obj
 
 
 @cli.command()
 @click.option("--scheme", type=click.Choice(["cvc", "acc"]), required=True)
-@click.option("--store", type=click.Path(), required=True)
+@click.option("--store", type=click.Path(), required=False)
 @click.option("--data", type=str, required=True, help="数据（hex|文件路径|直接字符串）")
-def append(scheme: str, store: str, data: str) -> None:
+@click.option("--connect", type=click.Path(), required=False, help="serve 守护进程的 socket；给出时请求由守护进程执行")
+def append(scheme: str, store: Optional[str], data: str, connect: Optional[str]) -> None:
     t0 = time.perf_counter()
-    path = Path(store)
     buf = _read_data_arg(data)
+    if connect:
+        res = _remote(connect, "append", scheme=scheme, data=buf)
+        click.echo(json.dumps({"ok": True, "index": res["index"], "root": len(res["root"]), "ms": int((time.perf_counter()-t0)*1000)}))
+        return
+    path = _store_path(store)
     if scheme == "acc":
         vds, mem, pub, st, state = _restore_acc(path)
         rec = vds.append(st, buf)
         # 记录 items（注意：从 mem 取最新 idx）
         idx = mem.acc_count()
-        d, tag, i, sigma = mem.get_acc_item(idx)
-        state["store"]["items"][str(idx)] = [d, tag, i, sigma]
+        if "data" not in state:
+            d, tag, i, sigma = mem.get_acc_item(idx)
+            state["store"]["items"][str(idx)] = [d, tag, i, sigma]
+        _close(mem)
         # 更新根
         state["pub"]["accumulator"] = rec.root.value
         _save_state(path, state)
@@ -162,28 +226,39 @@ def append(scheme: str, store: str, data: str) -> None:
         idx = st.cnt
         state["client_state"]["root"] = st.root.model_dump()
         state["client_state"]["cnt"] = st.cnt
-        state["items"][str(idx)] = buf
+        if "nodes" not in state:
+            state["items"][str(idx)] = buf
+        _close(mem)
         _save_state(path, state)
         click.echo(json.dumps({"ok": True, "index": idx, "root": len(rec.root.value), "ms": int((time.perf_counter()-t0)*1000)}))
 
 
 @cli.command()
 @click.option("--scheme", type=click.Choice(["cvc", "acc"]), required=True)
-@click.option("--store", type=click.Path(), required=True)
+@click.option("--store", type=click.Path(), required=False)
 @click.option("--index", type=int, required=True)
 @click.option("--out", type=str, required=False)
-def query(scheme: str, store: str, index: int, out: Optional[str]) -> None:
+@click.option("--connect", type=click.Path(), required=False, help="serve 守护进程的 socket")
+def query(scheme: str, store: Optional[str], index: int, out: Optional[str], connect: Optional[str]) -> None:
     t0 = time.perf_counter()
-    path = Path(store)
+    if connect:
+        payload = _remote(connect, "query", scheme=scheme, index=index)["proof"]
+        if out:
+            Path(out).write_bytes(payload)
+        click.echo(json.dumps({"ok": True, "scheme": scheme, "index": index, "proof_bytes": len(payload), "ms": int((time.perf_counter()-t0)*1000)}))
+        return
+    path = _store_path(store)
     if scheme == "acc":
         vds, mem, pub, st, state = _restore_acc(path)
         pr = vds.query(index)
+        _close(mem)
         if out:
             Path(out).write_bytes(pr.payload)
         click.echo(json.dumps({"ok": True, "scheme": scheme, "index": index, "proof_bytes": len(pr.payload), "ms": int((time.perf_counter()-t0)*1000)}))
     else:
         vds, mem, state = _restore_cvc(path)
         pr = vds.query(index)
+        _close(mem)
         if out:
             Path(out).write_bytes(pr.payload)
         click.echo(json.dumps({"ok": True, "scheme": scheme, "index": index, "proof_bytes": len(pr.payload), "ms": int((time.perf_counter()-t0)*1000)}))
@@ -191,19 +266,25 @@ def query(scheme: str, store: str, index: int, out: Optional[str]) -> None:
 
 @cli.command()
 @click.option("--scheme", type=click.Choice(["cvc", "acc"]), required=True)
-@click.option("--store", type=click.Path(), required=True)
+@click.option("--store", type=click.Path(), required=False)
 @click.option("--index", type=int, required=True)
 @click.option("--data", type=str, required=True)
 @click.option("--proof", type=str, required=True)
-def verify(scheme: str, store: str, index: int, data: str, proof: str) -> None:
+@click.option("--connect", type=click.Path(), required=False, help="serve 守护进程的 socket")
+def verify(scheme: str, store: Optional[str], index: int, data: str, proof: str, connect: Optional[str]) -> None:
     t0 = time.perf_counter()
     buf = _read_data_arg(data)
     payload = Path(proof).read_bytes()
-    path = Path(store)
+    if connect:
+        ok = _remote(connect, "verify", scheme=scheme, index=index, data=buf, proof=payload)["ok"]
+        click.echo(json.dumps({"ok": bool(ok), "ms": int((time.perf_counter()-t0)*1000)}))
+        return
+    path = _store_path(store)
     if scheme == "acc":
         vds, mem, pub, st, state = _restore_acc(path)
         pr = QueryProof(scheme="acc", index=index, payload=payload)
         ok = vds.verify(pub, index, buf, pr)
+        _close(mem)
     else:
         vds, mem, state = _restore_cvc(path)
         st_proxy = type("_ST", (), {})()
@@ -211,23 +292,31 @@ def verify(scheme: str, store: str, index: int, data: str, proof: str) -> None:
         st_proxy.pk = CVCParamsPK(**state["client_state"]["pk"])  # type: ignore[arg-type]
         st_proxy.sk = CVCParamsSK(**state["client_state"]["sk"])  # type: ignore[arg-type]
         st_proxy.root = RootDigest(**state["client_state"]["root"])  # type: ignore[arg-type]
+        st_proxy.versions = _cvc_versions(state)
         pr = QueryProof(scheme="cvc", index=index, payload=payload)
         ok = vds.verify(st_proxy, index, buf, pr)
+        _close(mem)
     click.echo(json.dumps({"ok": bool(ok), "ms": int((time.perf_counter()-t0)*1000)}))
 
 
 @cli.command()
 @click.option("--scheme", type=click.Choice(["cvc", "acc"]), required=True)
-@click.option("--store", type=click.Path(), required=True)
+@click.option("--store", type=click.Path(), required=False)
 @click.option("--index", type=int, required=True)
 @click.option("--data", type=str, required=True)
-def update(scheme: str, store: str, index: int, data: str) -> None:
+@click.option("--connect", type=click.Path(), required=False, help="serve 守护进程的 socket")
+def update(scheme: str, store: Optional[str], index: int, data: str, connect: Optional[str]) -> None:
     t0 = time.perf_counter()
-    path = Path(store)
     buf = _read_data_arg(data)
+    if connect:
+        res = _remote(connect, "update", scheme=scheme, index=index, data=buf)
+        click.echo(json.dumps({"ok": True, "root": len(res["root"]), "ms": int((time.perf_counter()-t0)*1000)}))
+        return
+    path = _store_path(store)
     if scheme == "acc":
         vds, mem, pub, st, state = _restore_acc(path)
         rec = vds.update(st, index, buf)
+        _close(mem)
         state["pub"]["accumulator"] = rec.root.value
         _save_state(path, state)
         click.echo(json.dumps({"ok": True, "root": len(rec.root.value), "ms": int((time.perf_counter()-t0)*1000)}))
@@ -239,11 +328,29 @@ def update(scheme: str, store: str, index: int, data: str) -> None:
         st_proxy.sk = CVCParamsSK(**state["client_state"]["sk"])  # type: ignore[arg-type]
         st_proxy.root = RootDigest(**state["client_state"]["root"])  # type: ignore[arg-type]
         st_proxy.cnt = int(state["client_state"]["cnt"])  # type: ignore[index]
+        st_proxy.versions = _cvc_versions(state)
         rec = vds.update(st_proxy, index, buf)
         state["client_state"]["root"] = st_proxy.root.model_dump()
+        state["client_state"]["versions"] = {str(k): v for k, v in st_proxy.versions.items()}
+        if "nodes" not in state:
+            # 旧格式靠重放恢复，需要记录更新
+            state.setdefault("updates", []).append([index, buf])
+        _close(mem)
         _save_state(path, state)
         click.echo(json.dumps({"ok": True, "root": len(rec.root.value), "ms": int((time.perf_counter()-t0)*1000)}))
 
 
+@cli.command()
+@click.option("--store", type=click.Path(), required=True, help="init 生成的状态文件")
+@click.option("--socket", "socket_path", type=click.Path(), required=False, help="Unix socket 路径（默认 <store>.sock）")
+@click.option("--allow-shutdown", is_flag=True, default=False, help="允许客户端经 socket 发送 shutdown")
+def serve(store: str, socket_path: Optional[str], allow_shutdown: bool) -> None:
+    """常驻进程：群、方案对象与存储只加载一次，经 Unix socket 处理 append/query/verify/update。"""
+    from .daemon import serve as run
+
+    sock = socket_path or str(Path(store).with_name(Path(store).name + ".sock"))
+    run(store, sock, ready=lambda: click.echo(json.dumps({"ok": True, "socket": sock})), allow_shutdown=allow_shutdown)
+
+
 if __name__ == "__main__":
     cli()
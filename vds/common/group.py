@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Sequence
 import hashlib
 from charm.toolbox.pairinggroup import ZR, G1
 from .errors import GroupError
@@ -52,6 +52,14 @@ def hash_to_Zp(grp: Any, data: bytes) -> Any:
         raise GroupError("hash_to_Zp failed") from e
 
 
+def hash_to_int(data: bytes, order: int) -> int:
+    """Integer form of hash_to_Zp: SHA-256 then mod order.
+
+    Equal to int(hash_to_Zp(grp, data)) when order == grp.order().
+    """
+    return int.from_bytes(hashlib.sha256(data).digest(), "big") % order
+
+
 def serialize_elem(grp: Any, elem: Any) -> bytes:
     try:
         return grp.serialize(elem)
@@ -75,6 +83,31 @@ def pair(grp: Any, a: Any, b: Any) -> Any:
         raise GroupError("pairing failed or charm not present") from e
 
 
+def pair_product(grp: Any, xs: Sequence[Any], ys: Sequence[Any]) -> Any:
+    """∏ e(xs[k], ys[k]).
+
+    Uses the multi-pairing of the charm build when it exposes one (Miller
+    loops multiplied together, one shared final exponentiation); otherwise
+    multiplies individual pairings.
+    """
+    if len(xs) != len(ys):
+        raise GroupError("pair_product: length mismatch")
+    multi = getattr(grp, "pair_prod", None)
+    if multi is None:
+        try:
+            from charm.core.math.pairing import pair_prod as multi  # type: ignore[no-redef]
+        except Exception:
+            multi = None
+    if multi is not None:
+        return multi(list(xs), list(ys))
+    from charm.toolbox.pairinggroup import GT, pair as _pair
+
+    acc = grp.init(GT, 1)
+    for x, y in zip(xs, ys):
+        acc *= _pair(x, y)
+    return acc
+
+
 def serialize_G1(grp: Any, elem: Any) -> bytes:
     """Canonical serializer for G1 elements (used for pointer hashing)."""
     return serialize_elem(grp, elem)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class GroupParams(BaseModel):
@@ -19,13 +19,18 @@ class RootDigest(BaseModel):
 
 
 class CVCNodeRecord(BaseModel):
+    """Stored state of CVC node idx (item idx and internal node idx).
+
+    Group/ZR values are charm-serialized; m, proofs and ledger are keyed by
+    1-based slot and hold only written slots.
+    """
+
     idx: int
-    parent: Optional[int]
-    slot: int
+    r: bytes
     commit: bytes
-    proof_data_slot1: bytes
-    proof_to_parent_slot: bytes
-    acc_update_token: Optional[bytes] = None
+    m: Dict[int, bytes] = {}
+    proofs: Dict[int, bytes] = {}
+    ledger: Dict[int, bytes] = {}
 
 
 class CVCAuthPathSeg(BaseModel):
@@ -35,7 +40,8 @@ class CVCAuthPathSeg(BaseModel):
 
 
 class CVCAuthPath(BaseModel):
-    segments: List[CVCAuthPathSeg]
+    # leaf first, root (idx 1) last
+    nodes: List[CVCNodeRecord]
 
 
 class ACCPublic(BaseModel):
@@ -43,6 +49,7 @@ class ACCPublic(BaseModel):
     gs: bytes
     vk_sig: bytes
     accumulator: bytes
+    epoch: int = 0
 
 
 class ACCProof(BaseModel):
@@ -57,6 +64,19 @@ class QueryProof(BaseModel):
     payload: bytes
 
 
+class MultiQueryProof(BaseModel):
+    scheme: str  # 'cvc'
+    indices: List[int]
+    payload: bytes
+
+
+class CVCCheckResult(BaseModel):
+    ok: bool
+    # level of the first failing opening (0 = leaf, k = k-th ancestor segment);
+    # None when ok or when the proof failed before any pairing (signature, slot, root)
+    bad_segment: Optional[int] = None
+
+
 class AppendReceipt(BaseModel):
     index: int
     root: RootDigest
@@ -2,31 +2,243 @@ from __future__ import annotations
 
 """Chameleon Vector Commitment (CVC) primitives (Construction 2).
 
-实现 Commit/Open/Verify 与 KeyGen；更新与变色龙更新暂未实现。
+实现 Commit/Open/Verify 与 KeyGen；槽更新见 update_commit，变色龙更新见 VDSCVC.update。
 """
 
-from typing import Any, List, Dict
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import hashlib
 import os
 
 from charm.toolbox.pairinggroup import G1, ZR, pair
 
 from ..common.types import CVCParamsPK, CVCParamsSK
 from ..common import sig
+from ..common.errors import GroupError
 
 
-def keygen(grp: Any, q: int) -> tuple[CVCParamsPK, CVCParamsSK, dict]:
+class LazyHij:
+    """Mapping (i, j) -> serialized h_{i,j} = g^{z_i z_j}, filled one row at a time.
+
+    Row i is computed on the first lookup that misses it (q fixed-base
+    exponentiations of g) and written to ``cells`` for both (i, j) and (j, i).
+    ``cells`` is any store with get(k) -> bytes | None and item assignment,
+    keyed by (i-1)·n + (j-1); a plain dict by default, a memory-mapped array
+    for parameter bundles (see vds.cvc.params). Without trapdoors only cells
+    that are already present can be read.
+    """
+
+    def __init__(self, grp: Any, g_b: bytes, trapdoors_b: Optional[List[bytes]], n: int, cells: Any = None):
+        self.grp = grp
+        self.n = n
+        self._g_b = g_b
+        self._g: Any = None
+        self._z = trapdoors_b
+        self._cells: Any = {} if cells is None else cells
+
+    def _cell(self, i: int, j: int) -> int:
+        return (i - 1) * self.n + (j - 1)
+
+    def __getitem__(self, key: Tuple[int, int]) -> bytes:
+        i, j = key
+        if i == j or not (1 <= i <= self.n and 1 <= j <= self.n):
+            raise KeyError(key)
+        b = self._cells.get(self._cell(i, j))
+        if b is None:
+            self.fill_row(i)
+            b = self._cells.get(self._cell(i, j))
+        return b
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 2:
+            return False
+        i, j = key
+        return i != j and 1 <= i <= self.n and 1 <= j <= self.n
+
+    def fill_row(self, i: int) -> None:
+        if self._z is None:
+            raise GroupError(f"h_(i,j) row {i} not materialized and no trapdoors available")
+        if self._g is None:
+            self._g = self.grp.deserialize(self._g_b)
+            self._g.initPP()
+        z_i = self.grp.deserialize(self._z[i - 1])
+        for j in range(1, self.n + 1):
+            if j == i or self._cells.get(self._cell(i, j)) is not None:
+                continue
+            b = self.grp.serialize(self._g ** (z_i * self.grp.deserialize(self._z[j - 1])))
+            self._cells[self._cell(i, j)] = b
+            self._cells[self._cell(j, i)] = b
+
+    def materialize(self) -> None:
+        for i in range(1, self.n + 1):
+            self.fill_row(i)
+
+
+# --- Fixed-base tables ---
+# Bases g, h_i and h_{i,j} never change after keygen. BaseTables keeps them
+# deserialized and gives each one charm's fixed-base exponentiation table
+# (initPP, a windowed table of base^{d·2^{wk}}). One process-wide byte budget
+# covers every registered parameter set, deserialized elements and tables
+# alike: bases that would overrun it are kept without a table, and when the
+# registry as a whole is over budget the least recently used sets are evicted.
+PP_WINDOW = 5  # window width assumed for the footprint estimate
+DEFAULT_TABLE_BUDGET = 64 << 20
+
+_budget = {"limit": DEFAULT_TABLE_BUDGET, "used": 0}
+# LRU (id(grp), digest of g, h_list) -> tables; a set holds its grp, so the id
+# cannot be reused while the entry exists
+_registry: "OrderedDict[Tuple[int, bytes], BaseTables]" = OrderedDict()
+
+
+class BaseTables:
+    """Deserialized CVC bases with fixed-base tables for one parameter set."""
+
+    def __init__(self, grp: Any, g_b: bytes, h_list_b: List[bytes], hij: Any):
+        self.grp = grp
+        self._hij_src = hij
+        bits = grp.order().bit_length()
+        self._elem_bytes = len(g_b)
+        # a table holds about ceil(bits/w)·2^w elements
+        self._table_cost = ((bits + PP_WINDOW - 1) // PP_WINDOW << PP_WINDOW) * self._elem_bytes
+        self.tables = 0
+        self.table_bytes = 0
+        # bytes charged to the budget (elements + tables); 0 once released
+        self.charged = 0
+        self._counted = True
+        self.g = self._prepare(grp.deserialize(g_b))
+        self.h_list = [self._prepare(grp.deserialize(b)) for b in h_list_b]
+        self._by_bytes = dict(zip(h_list_b, self.h_list))
+        self._hij: Dict[Tuple[int, int], Any] = {}
+
+    def _charge(self, n: int) -> None:
+        self.charged += n
+        _budget["used"] += n
+
+    def _prepare(self, elem: Any) -> Any:
+        if not self._counted:  # evicted: still usable, no longer budgeted
+            return elem
+        self._charge(self._elem_bytes)
+        if _budget["used"] + self._table_cost <= _budget["limit"]:
+            try:
+                elem.initPP()
+            except Exception:  # pragma: no cover - plain exponentiation still works
+                return elem
+            self._charge(self._table_cost)
+            self.tables += 1
+            self.table_bytes += self._table_cost
+        return elem
+
+    def h(self, i: int) -> Any:
+        """h_i, 1-based."""
+        return self.h_list[i - 1]
+
+    def h_from_bytes(self, b: bytes) -> Any:
+        e = self._by_bytes.get(b)
+        return e if e is not None else self.grp.deserialize(b)
+
+    def hij(self, i: int, j: int) -> Any:
+        key = (i, j) if i < j else (j, i)  # h_{i,j} = h_{j,i}
+        e = self._hij.get(key)
+        if e is None:
+            e = self._hij[key] = self._prepare(self.grp.deserialize(self._hij_src[key]))
+            _trim(self)
+        return e
+
+    def commit(self, m: Dict[int, Any], r: Any) -> Any:
+        """C = g^r ∏ h_i^{m_i} over the written slots of a sparse vector."""
+        C = self.g ** r
+        for i, v in m.items():
+            C *= self.h_list[i - 1] ** v
+        return C
+
+    def open(self, i: int, m: Dict[int, Any], r: Any) -> Any:
+        """π_i = h_i^r ∏_{j≠i} h_{i,j}^{m_j} over the written slots."""
+        pi = self.h_list[i - 1] ** r
+        for j, v in m.items():
+            if j != i:
+                pi *= self.hij(i, j) ** v
+        return pi
+
+    def footprint(self) -> Dict[str, int]:
+        n = 1 + len(self.h_list) + len(self._hij)
+        return {
+            "elements": n,
+            "element_bytes": n * self._elem_bytes,
+            "tables": self.tables,
+            "table_bytes": self.table_bytes,
+        }
+
+    def release(self) -> None:
+        """Return this set's bytes to the budget; instances still holding it keep working."""
+        _budget["used"] -= self.charged
+        self.charged = 0
+        self._counted = False
+
+
+def _trim(keep: BaseTables) -> None:
+    """Evict least recently used parameter sets (never ``keep``) while over budget."""
+    for key in list(_registry):
+        if _budget["used"] <= _budget["limit"]:
+            break
+        if _registry[key] is not keep:
+            _registry.pop(key).release()
+
+
+def base_tables(grp: Any, g_b: bytes, h_list_b: List[bytes], hij: Any) -> BaseTables:
+    """Shared BaseTables for (grp, g, h_1..h_{q+1}); built on first request."""
+    key = (id(grp), hashlib.sha256(g_b + b"".join(h_list_b)).digest())
+    t = _registry.get(key)
+    if t is None:
+        t = _registry[key] = BaseTables(grp, g_b, h_list_b, hij)
+    _registry.move_to_end(key)
+    _trim(t)
+    return t
+
+
+def set_table_budget(limit_bytes: int) -> None:
+    """Cap the estimated bytes of all registered parameter sets (elements and tables)."""
+    _budget["limit"] = limit_bytes
+
+
+def table_footprint() -> Dict[str, int]:
+    """Totals over every registered parameter set."""
+    total = {"parameter_sets": len(_registry), "elements": 0, "element_bytes": 0, "tables": 0, "table_bytes": 0}
+    for t in _registry.values():
+        for k, v in t.footprint().items():
+            total[k] += v
+    total["used"] = _budget["used"]
+    total["limit"] = _budget["limit"]
+    return total
+
+
+def clear_base_tables() -> None:
+    for t in _registry.values():
+        t.release()
+    _registry.clear()
+
+
+def keygen(grp: Any, q: int, lazy: bool = False) -> tuple[CVCParamsPK, CVCParamsSK, dict]:
+    """Generate CVC parameters.
+
+    With lazy=True the (q+1)^2 cross bases h_{i,j} are not computed here;
+    server_bootstrap["hij"] is a LazyHij that fills rows on first use.
+    """
     # generator in G1
     g = grp.random(G1)
     # slot trapdoors z_i and bases h_i = g^{z_i}
     z_list = [grp.random(ZR) for _ in range(q + 1)]
     h_list = [g ** z for z in z_list]
-    # h_{i,j} for i!=j: deterministically h_{i,j} = g^{z_i * z_j}
-    hij: Dict[tuple[int, int], bytes] = {}
-    for i in range(q + 1):
-        for j in range(q + 1):
-            if i == j:
-                continue
-            hij[(i + 1, j + 1)] = grp.serialize(g ** (z_list[i] * z_list[j]))
+    hij: Any
+    if lazy:
+        hij = LazyHij(grp, grp.serialize(g), [grp.serialize(z) for z in z_list], q + 1)
+    else:
+        # h_{i,j} for i!=j: deterministically h_{i,j} = g^{z_i * z_j}
+        hij = {}
+        for i in range(q + 1):
+            for j in range(q + 1):
+                if i == j:
+                    continue
+                hij[(i + 1, j + 1)] = grp.serialize(g ** (z_list[i] * z_list[j]))
     # sign h_i values (public key compression; here仅打包h_i，验签可后续补)
     ssk, vk = sig.keygen()
     signed_hi: List[bytes] = []
@@ -46,25 +258,35 @@ def keygen(grp: Any, q: int) -> tuple[CVCParamsPK, CVCParamsSK, dict]:
     return pk, sk, server_bootstrap
 
 
-def commit_vec(grp: Any, g_b: bytes, h_list_b: List[bytes], m_list: List[Any], r: Any) -> bytes:
+def _slots(m: Union[List[Any], Dict[int, Any]]) -> Iterator[Tuple[int, Any]]:
+    """Yield (1-based slot, m_slot) for the non-zero entries of a dense or sparse vector.
+
+    A dict is taken as already sparse (slot -> value); a list is dense, slot
+    k+1 at position k, and its zero entries are skipped.
+    """
+    if isinstance(m, dict):
+        yield from m.items()
+        return
+    for k, v in enumerate(m, start=1):
+        if v is not None and int(v) != 0:
+            yield k, v
+
+
+def commit_vec(grp: Any, g_b: bytes, h_list_b: List[bytes], m_list: Union[List[Any], Dict[int, Any]], r: Any) -> bytes:
     g = grp.deserialize(g_b)
     C = g ** r
-    for i, m in enumerate(m_list):
-        if m is None:
-            continue
-        if int(str(m)) == 0:
-            continue
-        h_i = grp.deserialize(h_list_b[i])
+    for i, m in _slots(m_list):
+        h_i = grp.deserialize(h_list_b[i - 1])
         C *= h_i ** m
     return grp.serialize(C)
 
 
-def open_slot(grp: Any, h_i_b: bytes, hij_row: Dict[int, bytes], m_list: List[Any], r: Any) -> bytes:
+def open_slot(grp: Any, h_i_b: bytes, hij_row: Dict[int, bytes], m_list: Union[List[Any], Dict[int, Any]], r: Any) -> bytes:
     # π_i = h_i^r * ∏_{j≠i} h_{i,j}^{m_j}
     h_i = grp.deserialize(h_i_b)
     pi = h_i ** r
     # index of i not given; hij_row keyed by j
-    for j, m in enumerate(m_list, start=1):
+    for j, m in _slots(m_list):
         if j in hij_row:
             hij = grp.deserialize(hij_row[j])
             pi *= hij ** m
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+"""On-disk CVC parameter bundle.
+
+Keygen runs once; later processes map the file and read only what they touch.
+Every group element is stored at a fixed width (the serialized length of g on
+the curve), so records are addressed directly:
+
+    header  magic(8) | q (u32) | width (u32)
+    vk      32 bytes (Ed25519)
+    g       width
+    h_i     (q+1) × width
+    sig_i   (q+1) × 64          signature over h_i || i
+    h_{i,j} (q+1)^2 × width     all-zero until the row is materialized
+
+The h_{i,j} table is filled lazily through cvc_core.LazyHij and written back
+into the mapping, so a row costs its exponentiations once per bundle rather
+than once per process. The owner's trapdoors are never written here.
+"""
+
+import struct
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from ..common.errors import GroupError
+from ..common.types import CVCParamsPK, CVCParamsSK
+from ..storage.mmarray import FixedWidthArray, map_file
+from .cvc_core import LazyHij, keygen
+
+MAGIC = b"VDSCVCP\x01"
+_HEADER = struct.Struct(">8sII")
+VK_BYTES = 32
+SIG_BYTES = 64
+
+
+class CVCParamBundle:
+    def __init__(self, path: Union[str, Path], grp: Any, sk: Optional[CVCParamsSK] = None, writable: bool = True):
+        self.path = Path(path)
+        self.grp = grp
+        self._writable = writable
+        self._mm = map_file(self.path, writable=writable)
+        magic, q, width = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise GroupError(f"{self.path}: not a CVC parameter bundle")
+        if sk is not None and sk.q != q:
+            raise GroupError("parameter bundle q does not match the owner key")
+        self.q = q
+        self.width = width
+        n = q + 1
+        off = _HEADER.size
+        self.vk = bytes(self._mm[off : off + VK_BYTES])
+        off += VK_BYTES
+        self.g = bytes(self._mm[off : off + width])
+        off += width
+        self._h = FixedWidthArray(self._mm, off, n, width)
+        off += n * width
+        self._sigs = FixedWidthArray(self._mm, off, n, SIG_BYTES)
+        off += n * SIG_BYTES
+        self._hij_cells = FixedWidthArray(self._mm, off, n * n, width)
+        self.hij = LazyHij(grp, self.g, sk.trapdoors if sk is not None else None, n, cells=self._hij_cells)
+
+    @staticmethod
+    def file_size(q: int, width: int) -> int:
+        n = q + 1
+        return _HEADER.size + VK_BYTES + width + n * width + n * SIG_BYTES + n * n * width
+
+    @classmethod
+    def create(cls, path: Union[str, Path], grp: Any, q: int) -> tuple["CVCParamBundle", CVCParamsPK, CVCParamsSK]:
+        """Run keygen (without h_{i,j}) and write a new bundle to path."""
+        pk, sk, boot = keygen(grp, q, lazy=True)
+        width = len(pk.g)
+        h_list: List[bytes] = boot["h_list"]
+        if any(len(h) != width for h in h_list):
+            raise GroupError("group elements do not serialize to a fixed width")
+        parts = [_HEADER.pack(MAGIC, q, width), boot["vk"], pk.g]
+        parts.extend(h_list)
+        parts.extend(s[len(h) :] for s, h in zip(pk.signed_hi, h_list))
+        body = b"".join(parts)
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with open(p, "wb") as fh:
+            fh.write(body)
+            fh.truncate(cls.file_size(q, width))
+        return cls(p, grp, sk=sk), pk, sk
+
+    def h_list(self) -> List[bytes]:
+        return [self._h[k] for k in range(self.q + 1)]
+
+    def pk(self) -> CVCParamsPK:
+        signed = [self._h[k] + self._sigs[k] for k in range(self.q + 1)]
+        return CVCParamsPK(g=self.g, signed_hi=signed, q=self.q)
+
+    def bootstrap(self) -> dict:
+        """Server view in the shape keygen returns (h_list, hij, vk)."""
+        return {"h_list": self.h_list(), "hij": self.hij, "vk": self.vk}
+
+    def flush(self) -> None:
+        if self._writable:
+            self._mm.flush()
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self.flush()
+            self._mm.close()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+"""Heap-ordered q-ary tree used by VDS-CVC.
+
+Node 1 is the root; the children of node p are q(p-1)+2 .. qp+1. Every node
+is also a data item, so item i lives in node i and its child pointers sit in
+slots 2..q+1 of the parent's vector.
+"""
+
+from typing import List
+
+
+def parent(x: int, q: int) -> int:
+    return (x - 2) // q + 1 if x != 1 else 1
+
+
+def slot_in_parent(x: int, q: int) -> int:
+    """1..q position of x among its parent's children (0 for the root)."""
+    return x - (q * (parent(x, q) - 1) + 2) + 1 if x != 1 else 0
+
+
+def path(idx: int, q: int) -> List[int]:
+    """Node indices from idx up to the root, inclusive."""
+    out = [idx]
+    while idx != 1:
+        idx = parent(idx, q)
+        out.append(idx)
+    return out
@@ -1,153 +1,336 @@
 from __future__ import annotations
 
-from typing import Any
+from pathlib import Path
+import heapq
+import secrets
+from typing import Any, Dict, List, Tuple
 
 from ..common.types import (
     CVCParamsPK,
     CVCParamsSK,
+    CVCNodeRecord,
     RootDigest,
     QueryProof,
+    MultiQueryProof,
+    CVCCheckResult,
     AppendReceipt,
     UpdateReceipt,
 )
-from ..common.errors import VerifyError, GroupError
-from ..common.group import hash_to_Zp, serialize_G1, H_zr
-from ..common import ser, sig
-from .cvc_core import keygen as cvc_keygen, commit_vec, open_slot, verify_slot, update_commit
-from charm.toolbox.pairinggroup import ZR, G1
+from ..common.errors import VerifyError, GroupError, StorageError
+from ..common.group import hash_to_Zp, serialize_G1, H_zr, pair_product
+from ..common import ser
+from ..common.multiexp import multiexp
+from .cvc_core import BaseTables, base_tables, keygen as cvc_keygen, verify_slot
+from .params import CVCParamBundle
+from . import tree
+from .verifier import TrustedNodeCache
+from charm.toolbox.pairinggroup import ZR, G1, GT
 
 
 class CVCClientState:
-    def __init__(self, pk: CVCParamsPK, sk: CVCParamsSK, root: RootDigest, cnt: int = 0):
+    """Owner/verifier state: keys, root, item count and per-item update versions.
+
+    A chameleon update keeps the root, so the root alone cannot tell the
+    current item from a replaced one; versions[idx] counts the updates of idx
+    and is bound into its leaf value (see VDSCVC._leaf_m). Items never updated
+    have no entry.
+    """
+
+    def __init__(self, pk: CVCParamsPK, sk: CVCParamsSK, root: RootDigest, cnt: int = 0, versions: Dict[int, int] | None = None):
         self.pk = pk
         self.sk = sk
         self.root = root
         self.cnt = cnt
+        self.versions: Dict[int, int] = dict(versions or {})
+
+
+class CVCNode:
+    """Server-side state of one tree node (item i and internal node i).
+
+    m holds only the slots that were written (1 = data, 2..q+1 = child
+    pointers), keyed by 1-based slot; absent slots are zero. A leaf carries a
+    single entry and an internal node one per child, instead of q+1 ZR
+    elements each.
+    """
+
+    __slots__ = ("r", "m", "C", "ledger", "proofs")
+
+    def __init__(self, r: Any, m: Dict[int, Any], C: Any):
+        self.r = r
+        self.m = m
+        self.C = C
+        self.ledger: Dict[int, Any] = {}
+        self.proofs: Dict[int, Any] = {}
 
 
 class VDSCVC:
-    def __init__(self, store: Any, grp: Any, q: int = 64):
+    def __init__(self, store: Any, grp: Any, q: int = 64, trusted_cache_size: int = 4096):
         self.store = store
         self.grp = grp
         self.q = q
-        # 内部节点状态：idx -> {r: ZR, m: List[ZR], C: G1}
-        self._nodes: dict[int, dict] = {}
+        # 节点状态：idx -> CVCNode（r: ZR, m: 稀疏槽位, C: G1）
+        self._nodes: dict[int, CVCNode] = {}
         self._bootstrap: dict | None = None
         self._pk: CVCParamsPK | None = None
         self._sk: CVCParamsSK | None = None
+        self.params: CVCParamBundle | None = None
+        self.trusted = TrustedNodeCache(trusted_cache_size)
+        self._tables: BaseTables | None = None
+
+    def setup(self, params_path: str | None = None, sk: CVCParamsSK | None = None) -> tuple[CVCClientState, dict]:
+        """Initialise keys and the root node.
 
-    def setup(self) -> tuple[CVCClientState, dict]:
-        pk, sk, bootstrap = cvc_keygen(self.grp, self.q)
+        - params_path=None: fresh in-memory keys; h_{i,j} rows are computed on first use
+        - params_path missing on disk: fresh keys, written there as a CVCParamBundle
+        - params_path existing: reuse that bundle with the owner key sk; if the
+          store already holds the tree, it is picked up as is (st.cnt from the store)
+        """
+        reopen = params_path is not None and Path(params_path).exists()
+        if params_path is None:
+            pk, sk, bootstrap = cvc_keygen(self.grp, self.q, lazy=True)
+        elif reopen:
+            if sk is None:
+                raise GroupError("owner key required to reopen a parameter bundle")
+            self.params = CVCParamBundle(params_path, self.grp, sk=sk)
+            pk, bootstrap = self.params.pk(), self.params.bootstrap()
+        else:
+            self.params, pk, sk = CVCParamBundle.create(params_path, self.grp, self.q)
+            bootstrap = self.params.bootstrap()
+        if pk.q != self.q:
+            raise GroupError(f"parameter q={pk.q} does not match VDSCVC q={self.q}")
         self._bootstrap = bootstrap
         self._pk = pk
         self._sk = sk
-        # 预置根节点（idx=1），r_1 = PRF(1)，m 全 0
-        r1 = self._prf(1)
-        m0 = [self.grp.init(ZR, 0) for _ in range(self.q + 1)]
-        C_root = self.grp.deserialize(commit_vec(self.grp, pk.g, bootstrap["h_list"], m0, r1))
-        self._nodes[1] = {"r": r1, "m": m0, "C": C_root, "ledger": {}, "proofs": {}}
-        root = RootDigest(value=self.grp.serialize(C_root))
-        st = CVCClientState(pk=pk, sk=sk, root=root, cnt=0)
+        self._tables = base_tables(self.grp, pk.g, bootstrap["h_list"], bootstrap["hij"])
+        self._nodes = {}
+        # nodes and signatures trusted under the previous keys mean nothing now
+        self.trusted.clear()
+        root_node: CVCNode | None = None
+        cnt = 0
+        if reopen:
+            # 复用 store 中已持久化的树：只读根节点
+            try:
+                root_node = self._node(1)
+                cnt = self.store.cvc_count()
+            except StorageError:
+                pass
+        if root_node is None:
+            # 预置根节点（idx=1），r_1 = PRF(1)，m 全 0
+            r1 = self._prf(1)
+            C_root = self._tables.commit({}, r1)
+            root_node = CVCNode(r1, {}, C_root)
+            self._nodes[1] = root_node
+            self.store.apply_cvc_updates([self._record(1, root_node)])
+        root = RootDigest(value=self.grp.serialize(root_node.C))
+        st = CVCClientState(pk=pk, sk=sk, root=root, cnt=cnt)
         return st, {"note": "server caches hij and h_list"}
 
     def append(self, st: CVCClientState, data: bytes) -> AppendReceipt:
         if not self._bootstrap or not self._pk or not self._sk:
             raise GroupError("setup not completed")
-        h_list = self._bootstrap["h_list"]
-        hij = self._bootstrap["hij"]
-        g_b = self._pk.g
         # 新叶编号
         i = st.cnt + 1
         # 叶
         r_i = self._prf(i)
         m_data = hash_to_Zp(self.grp, data)
-        leaf_m = [self.grp.init(ZR, 0) for _ in range(self.q + 1)]
-        leaf_m[0] = m_data
-        C_leaf_b = commit_vec(self.grp, g_b, h_list, leaf_m, r_i)
-        C_leaf = self.grp.deserialize(C_leaf_b)
-        self._nodes[i] = {"r": r_i, "m": leaf_m, "C": C_leaf, "ledger": {}, "proofs": {}}
+        leaf_m = {1: m_data}
+        leaf = CVCNode(r_i, leaf_m, self._tables.commit(leaf_m, r_i))
+        leaf.proofs[1] = self._open(leaf, 1)
+        self._nodes[i] = leaf
         # 向上更新父链（堆式 q 叉树）
-        def parent(x: int) -> int:
-            return (x - 2) // self.q + 1 if x != 1 else 1
-        def slot_in_parent(x: int) -> int:
-            p = parent(x)
-            return x - (self.q * (p - 1) + 2) + 1 if x != 1 else 0
-
+        parents = []
         child = i
         while child != 1:
-            p = parent(child)
-            slot = slot_in_parent(child)  # 1..q
-            slot_idx = slot + 1           # 槽2..q+1 为子指针
+            p = self._parent(child)
+            slot_idx = self._slot_in_parent(child) + 1  # 槽2..q+1 为子指针
             # 初始化父节点如未存在
-            if p not in self._nodes:
+            try:
+                node = self._node(p)
+            except StorageError:
                 r_p = self._prf(p)
-                m0 = [self.grp.init(ZR, 0) for _ in range(self.q + 1)]
-                C0 = self.grp.deserialize(commit_vec(self.grp, g_b, h_list, m0, r_p))
-                self._nodes[p] = {"r": r_p, "m": m0, "C": C0, "ledger": {}, "proofs": {}}
+                C0 = self._tables.commit({}, r_p)
+                node = self._nodes[p] = CVCNode(r_p, {}, C0)
             # 更新父节点对应槽位值 m_ptr
-            m_ptr = H_zr(self.grp, serialize_G1(self.grp, self._nodes[child]["C"]))
-            old = self._nodes[p]["m"][slot_idx - 1]
-            delta = m_ptr - old
-            self._nodes[p]["m"][slot_idx - 1] = m_ptr
-            # 更新父节点承诺
-            h_slot_b = h_list[slot_idx - 1]
-            self._nodes[p]["C"] = self.grp.deserialize(
-                update_commit(self.grp, self.grp.serialize(self._nodes[p]["C"]), h_slot_b, delta)
-            )
-            # 账本与基证明
-            led = self._nodes[p]["ledger"]
-            led[slot_idx] = led.get(slot_idx, self.grp.init(ZR, 0)) + delta
-            proofs = self._nodes[p]["proofs"]
-            if slot_idx not in proofs:
-                # base proof = h_slot^{r_p}
-                hslot = self.grp.deserialize(h_slot_b)
-                proofs[slot_idx] = hslot ** self._nodes[p]["r"]
+            m_ptr = H_zr(self.grp, serialize_G1(self.grp, self._nodes[child].C))
+            self._set_slot(node, slot_idx, m_ptr)
+            parents.append(self._record(p, node))
             child = p
+        self.store.put_cvc_insert_path(self._record(i, leaf), parents)
         # 更新根
-        root_C = self._nodes[1]["C"]
+        root_C = self._nodes[1].C
         st.root = RootDigest(value=self.grp.serialize(root_C))
         st.cnt = i
         return AppendReceipt(index=i, root=st.root)
 
-    def query(self, idx: int) -> QueryProof:
-        if idx not in self._nodes:
+    def append_many(self, st: CVCClientState, items: List[bytes]) -> List[AppendReceipt]:
+        """Append several items, updating every touched ancestor once.
+
+        Nodes are finalised from the highest index down (a child always has a
+        larger index than its parent), so when node x is reached all of its
+        new child pointers are known and are written with one _set_slots call.
+        k items touch about k + k/q + k/q^2 + … nodes instead of k·depth.
+        All receipts carry the root after the whole batch.
+        """
+        if not self._bootstrap or not self._pk or not self._sk:
+            raise GroupError("setup not completed")
+        if not items:
+            return []
+        first = st.cnt + 1
+        last = st.cnt + len(items)
+        leaves: Dict[int, CVCNode] = {}
+        for i, data in enumerate(items, start=first):
+            r_i = self._prf(i)
+            leaf_m = {1: hash_to_Zp(self.grp, data)}
+            leaf = CVCNode(r_i, leaf_m, self._tables.commit(leaf_m, r_i))
+            leaf.proofs[1] = self._open(leaf, 1)
+            leaves[i] = self._nodes[i] = leaf
+        # pending[p][slot] = new pointer value for parent p
+        pending: Dict[int, Dict[int, Any]] = {}
+        heap = [-i for i in leaves]
+        heapq.heapify(heap)
+        queued = set(leaves)
+        changed: Dict[int, CVCNode] = {}
+        while heap:
+            x = -heapq.heappop(heap)
+            if x in leaves:
+                node = leaves[x]
+            else:
+                try:
+                    node = self._node(x)
+                except StorageError:
+                    r_x = self._prf(x)
+                    C0 = self._tables.commit({}, r_x)
+                    node = self._nodes[x] = CVCNode(r_x, {}, C0)
+            if x in pending:
+                self._set_slots(node, pending.pop(x))
+            changed[x] = node
+            if x == 1:
+                continue
+            p = self._parent(x)
+            m_ptr = H_zr(self.grp, serialize_G1(self.grp, node.C))
+            pending.setdefault(p, {})[self._slot_in_parent(x) + 1] = m_ptr
+            if p not in queued:
+                queued.add(p)
+                heapq.heappush(heap, -p)
+        # one store write: the last leaf plus every other node the batch changed
+        rest = [self._record(x, n) for x, n in changed.items() if x != last]
+        self.store.put_cvc_insert_path(self._record(last, changed[last]), rest)
+        st.root = RootDigest(value=self.grp.serialize(self._nodes[1].C))
+        st.cnt = last
+        return [AppendReceipt(index=i, root=st.root) for i in range(first, last + 1)]
+
+    # --- 树结构（堆式 q 叉树） ---
+    def _parent(self, x: int) -> int:
+        return tree.parent(x, self.q)
+
+    def _slot_in_parent(self, x: int) -> int:
+        return tree.slot_in_parent(x, self.q)
+
+    # --- 节点持久化（store 为准，_nodes 为已解码节点的写穿缓存） ---
+    def _record(self, idx: int, node: CVCNode) -> CVCNodeRecord:
+        ser_ = self.grp.serialize
+        return CVCNodeRecord(
+            idx=idx,
+            r=ser_(node.r),
+            commit=ser_(node.C),
+            m={k: ser_(v) for k, v in node.m.items()},
+            proofs={k: ser_(v) for k, v in node.proofs.items()},
+            ledger={k: ser_(v) for k, v in node.ledger.items()},
+        )
+
+    def _decode(self, rec: CVCNodeRecord) -> CVCNode:
+        de = self.grp.deserialize
+        node = CVCNode(de(rec.r), {k: de(v) for k, v in rec.m.items()}, de(rec.commit))
+        node.proofs = {k: de(v) for k, v in rec.proofs.items()}
+        node.ledger = {k: de(v) for k, v in rec.ledger.items()}
+        return node
+
+    def _node(self, idx: int) -> CVCNode:
+        node = self._nodes.get(idx)
+        if node is None:
+            node = self._nodes[idx] = self._decode(self.store.get_cvc_node(idx))
+        return node
+
+    def _load_path(self, idx: int) -> None:
+        """Make sure idx and its ancestors are decoded, with one store path read."""
+        if any(i not in self._nodes for i in tree.path(idx, self.q)):
+            for rec in self.store.get_cvc_auth_path(idx, self.q).nodes:
+                if rec.idx not in self._nodes:
+                    self._nodes[rec.idx] = self._decode(rec)
+
+    def _check_index(self, idx: int) -> None:
+        if not 1 <= idx <= self.store.cvc_count():
             raise VerifyError("index not found")
+
+    # --- 槽位证明账本 ---
+    def _hij(self, i: int, j: int) -> Any:
+        return self._tables.hij(i, j)
+
+    def _open(self, node: CVCNode, i: int) -> Any:
+        """Full opening π_i of a node from its current vector (one exponentiation per written slot)."""
+        return self._tables.open(i, node.m, node.r)  # type: ignore[union-attr]
+
+    def _set_slot(self, node: CVCNode, j: int, new_m: Any) -> None:
+        """Set slot j (1-based) to new_m and keep C and the cached openings current."""
+        self._set_slots(node, {j: new_m})
+
+    def _set_slots(self, node: CVCNode, updates: Dict[int, Any]) -> None:
+        """Write several slots of one node at once.
+
+        With δ_j = new m_j - old m_j: C ← C·∏ h_j^{δ_j}, and every cached π_i
+        becomes π_i·∏_{j≠i} h_{i,j}^{δ_j}; π_j does not depend on m_j. Each
+        product is one multi-exponentiation. A slot opened for the first time
+        gets one full opening, after which it is maintained here.
+        """
+        zero = self.grp.init(ZR, 0)
+        identity = self.grp.init(G1, 1)
+        deltas: Dict[int, Any] = {}
+        for j, new_m in updates.items():
+            deltas[j] = new_m - node.m.get(j, zero)
+            node.m[j] = new_m
+        slots = list(deltas)
+        node.C = node.C * multiexp(
+            self.grp, [self._tables.h(j) for j in slots], [deltas[j] for j in slots], identity
+        )
+        led = node.ledger
+        for j in slots:
+            led[j] = led.get(j, zero) + deltas[j]
+        proofs = node.proofs
+        for i in proofs:
+            others = [j for j in slots if j != i]
+            if others:
+                proofs[i] = proofs[i] * multiexp(
+                    self.grp, [self._hij(i, j) for j in others], [deltas[j] for j in others], identity
+                )
+        for j in slots:
+            if j not in proofs:
+                proofs[j] = self._open(node, j)
+
+    def query(self, idx: int) -> QueryProof:
         if not self._bootstrap or not self._pk:
             raise GroupError("setup not completed")
+        self._check_index(idx)
+        self._load_path(idx)
         h_list = self._bootstrap["h_list"]
-        hij = self._bootstrap["hij"]
-        # 叶段（直接 open_slot 计算当下证明）
+        # 叶段：读取维护中的槽 1 证明
         leaf = self._nodes[idx]
-        h1_b = h_list[0]
-        hij_row = {j: hij[(1, j)] for j in range(2, self.q + 2)}
-        pi_leaf_b = open_slot(self.grp, h1_b, hij_row, leaf["m"], leaf["r"])
         payload = {
-            "leaf_commit": self.grp.serialize(leaf["C"]),
-            "leaf_pi": pi_leaf_b,
-            "leaf_h": h1_b,
+            "leaf_commit": self.grp.serialize(leaf.C),
+            "leaf_pi": self.grp.serialize(leaf.proofs[1]),
+            "leaf_h": h_list[0],
             "leaf_signed_hi": self._pk.signed_hi[0],
             "segments": [],
         }
-        # 父链段
-        def parent(x: int) -> int:
-            return (x - 2) // self.q + 1 if x != 1 else 1
-        def slot_in_parent(x: int) -> int:
-            p = parent(x)
-            return x - (self.q * (p - 1) + 2) + 1 if x != 1 else 0
+        # 父链段：读取父节点对应子指针槽的证明，无需 open_slot
         child = idx
         while child != 1:
-            p = parent(child)
-            slot = slot_in_parent(child)
-            slot_idx = slot + 1
+            p = self._parent(child)
+            slot_idx = self._slot_in_parent(child) + 1
             node = self._nodes[p]
-            hslot_b = h_list[slot_idx - 1]
-            # 直接 open_slot 计算当下证明
-            hij_row_p = {k: hij[(slot_idx, k)] for k in range(1, self.q + 2) if k != slot_idx}
-            pi_b = open_slot(self.grp, hslot_b, hij_row_p, node["m"], node["r"])
             payload["segments"].append({
-                "node_commit": self.grp.serialize(node["C"]),
-                "proof": pi_b,
-                "h": hslot_b,
+                "node_commit": self.grp.serialize(node.C),
+                "proof": self.grp.serialize(node.proofs[slot_idx]),
+                "h": h_list[slot_idx - 1],
                 "signed_hi": self._pk.signed_hi[slot_idx - 1],
                 "slot": slot_idx,
             })
@@ -155,104 +338,283 @@ class VDSCVC:
         return QueryProof(scheme="cvc", index=idx, payload=ser.pack(payload))
 
     def verify(self, st: CVCClientState, idx: int, data: bytes, proof: QueryProof) -> bool:
+        """Check one item proof against st.root; verify_detail tells which level failed."""
+        return self.verify_detail(st, idx, data, proof).ok
+
+    def verify_detail(self, st: CVCClientState, idx: int, data: bytes, proof: QueryProof) -> CVCCheckResult:
+        """verify with the failing level reported, as for one entry of verify_batch.
+
+        Segments are walked upwards and the walk stops at the first node whose
+        commitment self.trusted already authenticated for this root; the
+        opening equations of the walked levels are then checked together with
+        one product of pairings (see _pairing_batch). If that fails, the levels
+        are re-checked one by one and bad_segment names the first bad one. On
+        success every node of the checked part of the path becomes trusted.
+        """
         if proof.scheme != "cvc":
             raise VerifyError("scheme mismatch")
         if not self._pk:
             raise GroupError("setup not completed")
-        g_b = self._pk.g
-        pld = ser.unpack(proof.payload, dict)
-        # 验证叶（验签 h_1）
+        return self.verify_batch(st, [(idx, data, proof)])[0]
+
+    def verify_batch(self, st: CVCClientState, items: List[Tuple[int, bytes, QueryProof]]) -> List[CVCCheckResult]:
+        """Verify many single-item proofs with one combined pairing check.
+
+        The opening equations of every level of every proof share one product
+        of pairings. If it fails, each proof is checked on its own and a
+        failing proof is re-checked level by level, so its result names the
+        first bad segment (0 = leaf opening, k = k-th ancestor segment).
+        """
+        self.trusted.sync(st.root.value)
+        results = [CVCCheckResult(ok=False) for _ in items]
+        walked: List[Tuple[int, list, list]] = []
+        for pos, (idx, data, proof) in enumerate(items):
+            if proof.scheme != "cvc":
+                raise VerifyError("scheme mismatch")
+            w = self._walk_proof(st, idx, data, ser.unpack(proof.payload, dict))
+            if w is not None:
+                walked.append((pos, w[0], w[1]))
+        if not walked:
+            return results
+        if self._pairing_batch([eq for _, eqs, _ in walked for eq in eqs]):
+            good = walked
+        else:
+            good = []
+            for pos, eqs, checked in walked:
+                # a lone proof already failed its own combined check
+                if len(walked) > 1 and self._pairing_batch(eqs):
+                    good.append((pos, eqs, checked))
+                else:
+                    results[pos] = CVCCheckResult(ok=False, bad_segment=self._first_bad(eqs))
+        for pos, _, checked in good:
+            results[pos] = CVCCheckResult(ok=True)
+            for i, c in checked:
+                self.trusted.trust(i, c)
+        return results
+
+    def _walk_proof(self, st: CVCClientState, idx: int, data: bytes, pld: dict) -> Tuple[list, list] | None:
+        """Structural part of verify: signatures, slots, trusted ancestor / root.
+
+        Returns (equations, checked nodes) where each equation is
+        (level, C, h, m, π) for e(C·h^{-m}, h) == e(π, g), or None if the proof
+        is malformed, a signature is wrong, or the chain does not reach the root.
+        """
+        trusted = self.trusted
+        vk = self._bootstrap.get("vk") if self._bootstrap else None
+        path = tree.path(idx, self.q)
+        segments = pld["segments"]
+        if len(segments) != len(path) - 1:
+            return None
+        # 叶（验签 h_1）
         C_leaf_b = pld["leaf_commit"]
-        pi_leaf_b = pld["leaf_pi"]
         h_leaf_b = pld["leaf_h"]
-        # verify signed hi
-        if self._bootstrap and "vk" in self._bootstrap:
-            vk = self._bootstrap["vk"]
+        if vk is not None:
             signed = pld.get("leaf_signed_hi")
-            if signed is not None:
-                # signed_hi format: h_bytes || sig (last 64 bytes)
-                sig_bytes = signed[-64:]
-                h_bytes = signed[:-64]
-                if not sig.verify(vk, h_bytes + (1).to_bytes(4, "big"), sig_bytes):
-                    return False
-                if h_bytes != h_leaf_b:
-                    return False
-        m_data = hash_to_Zp(self.grp, data)
-        if not verify_slot(self.grp, g_b, C_leaf_b, h_leaf_b, m_data, pi_leaf_b):
-            return False
+            if signed is not None and trusted.check_signed_hi(vk, 1, signed) != h_leaf_b:
+                return None
+        eqs = [(0, C_leaf_b, h_leaf_b, self._leaf_m(st, idx, data), pld["leaf_pi"])]
+        checked = [(idx, C_leaf_b)]
         child_C_b = C_leaf_b
-        # 逐段向上
-        for seg in pld["segments"]:
+        ok = trusted.is_trusted(idx, C_leaf_b)
+        # 逐段向上，遇到已信任祖先即停止
+        for level, (child, seg) in enumerate(zip(path, segments), start=1):
+            if ok:
+                break
             C_node_b = seg["node_commit"]
             h_b = seg["h"]
-            pi_b = seg["proof"]
-            # verify signed hi for this slot
-            if self._bootstrap and "vk" in self._bootstrap:
-                vk = self._bootstrap["vk"]
+            slot_idx = self._slot_in_parent(child) + 1
+            if seg.get("slot", slot_idx) != slot_idx:
+                return None
+            if vk is not None:
                 signed = seg.get("signed_hi")
-                slot_idx = seg.get("slot", 0)
-                if signed is not None and slot_idx:
-                    sig_bytes = signed[-64:]
-                    h_bytes = signed[:-64]
-                    if not sig.verify(vk, h_bytes + int(slot_idx).to_bytes(4, "big"), sig_bytes):
-                        return False
-                    if h_bytes != h_b:
-                        return False
-            m_ptr = H_zr(self.grp, child_C_b)
-            if not verify_slot(self.grp, g_b, C_node_b, h_b, m_ptr, pi_b):
-                return False
+                if signed is not None and trusted.check_signed_hi(vk, slot_idx, signed) != h_b:
+                    return None
+            eqs.append((level, C_node_b, h_b, H_zr(self.grp, child_C_b), seg["proof"]))
+            p = self._parent(child)
+            checked.append((p, C_node_b))
             child_C_b = C_node_b
+            ok = trusted.is_trusted(p, C_node_b)
         # 顶层是否等于本地 root
-        return child_C_b == st.root.value
+        if not ok and child_C_b != st.root.value:
+            return None
+        return eqs, checked
+
+    def _pairing_batch(self, eqs: list) -> bool:
+        """Check e(C_k·h_k^{-m_k}, h_k) == e(π_k, g) for all k at once.
+
+        With random 64-bit r_k the equations multiply into
+
+            ∏_slots e(∏_k C_k^{r_k} · h^{-Σ r_k m_k}, h) · e(∏_k π_k^{-r_k}, g) == 1
+
+        where the inner products run over the equations using that slot base
+        h; so a batch costs (distinct h + 1) pairings sharing one final
+        exponentiation, plus multi-exponentiations in G1.
+        """
+        if not eqs:
+            return True
+        p = self.grp.order()
+        identity = self.grp.init(G1, 1)
+        de = self.grp.deserialize
+        by_h: Dict[bytes, Tuple[list, list, int]] = {}
+        pis, neg_rs = [], []
+        for _, C_b, h_b, m, pi_b in eqs:
+            r = secrets.randbits(64) | 1
+            Cs, rs, rm = by_h.get(h_b, ([], [], 0))
+            Cs.append(de(C_b))
+            rs.append(r)
+            by_h[h_b] = (Cs, rs, (rm + r * int(m)) % p)
+            pis.append(de(pi_b))
+            neg_rs.append(-r % p)
+        xs, ys = [], []
+        for h_b, (Cs, rs, rm) in by_h.items():
+            h = self._tables.h_from_bytes(h_b)
+            xs.append(multiexp(self.grp, Cs + [h], rs + [-rm % p], identity))
+            ys.append(h)
+        xs.append(multiexp(self.grp, pis, neg_rs, identity))
+        ys.append(self._tables.g)
+        return pair_product(self.grp, xs, ys) == self.grp.init(GT, 1)
+
+    def _first_bad(self, eqs: list) -> int | None:
+        g_b = self._pk.g  # type: ignore[union-attr]
+        for level, C_b, h_b, m, pi_b in eqs:
+            if not verify_slot(self.grp, g_b, C_b, h_b, m, pi_b):
+                return level
+        return None
+
+    def query_many(self, indices: List[int]) -> MultiQueryProof:
+        """One proof for several items; shared ancestors appear once.
+
+        Payload:
+        - nodes: [idx, C] for every node on the union of the paths
+        - openings: [node, slot, π], one per leaf (slot 1) and per tree edge
+        - hs: [slot, signed_hi], one per distinct slot
+        """
+        if not self._bootstrap or not self._pk:
+            raise GroupError("setup not completed")
+        idxs = sorted(set(indices))
+        nodes: Dict[int, bytes] = {}
+        openings: Dict[Tuple[int, int], bytes] = {}
+        for idx in idxs:
+            self._check_index(idx)
+            self._load_path(idx)
+            openings[(idx, 1)] = self.grp.serialize(self._nodes[idx].proofs[1])
+            child = idx
+            nodes[child] = self.grp.serialize(self._nodes[child].C)
+            while child != 1:
+                p = self._parent(child)
+                slot_idx = self._slot_in_parent(child) + 1
+                if (p, slot_idx) in openings:
+                    break  # the rest of the path is already in the proof
+                node = self._nodes[p]
+                nodes[p] = self.grp.serialize(node.C)
+                openings[(p, slot_idx)] = self.grp.serialize(node.proofs[slot_idx])
+                child = p
+        slots = sorted({slot for _, slot in openings})
+        payload = {
+            "nodes": [[i, c] for i, c in sorted(nodes.items())],
+            "openings": [[i, slot, pi] for (i, slot), pi in sorted(openings.items())],
+            "hs": [[slot, self._pk.signed_hi[slot - 1]] for slot in slots],
+        }
+        return MultiQueryProof(scheme="cvc", indices=idxs, payload=ser.pack(payload))
+
+    def verify_many(self, st: CVCClientState, items: Dict[int, bytes], proof: MultiQueryProof) -> bool:
+        """Check a query_many proof for items {idx: data} against st.root.
+
+        Every signed h_i and every internal-node opening is checked once,
+        however many of the items share it, and all openings go into a single
+        product of pairings.
+        """
+        if proof.scheme != "cvc":
+            raise VerifyError("scheme mismatch")
+        if not self._pk:
+            raise GroupError("setup not completed")
+        pld = ser.unpack(proof.payload, dict)
+        nodes = {int(i): c for i, c in pld["nodes"]}
+        openings = {(int(i), int(slot)): pi for i, slot, pi in pld["openings"]}
+        signed = {int(slot): s for slot, s in pld["hs"]}
+        if nodes.get(1) != st.root.value:
+            return False
+        # required (node, slot) -> committed value
+        need: Dict[Tuple[int, int], Any] = {}
+        for idx, data in items.items():
+            if idx not in nodes:
+                return False
+            need[(idx, 1)] = self._leaf_m(st, idx, data)
+            child = idx
+            while child != 1:
+                p = self._parent(child)
+                key = (p, self._slot_in_parent(child) + 1)
+                if key in need:
+                    break
+                if p not in nodes:
+                    return False
+                need[key] = H_zr(self.grp, nodes[child])
+                child = p
+        vk = self._bootstrap.get("vk") if self._bootstrap else None
+        h_of: Dict[int, bytes] = {}
+        for slot in {slot for _, slot in need}:
+            blob = signed.get(slot)
+            if blob is None:
+                return False
+            h_bytes = blob[:-64] if vk is None else self.trusted.check_signed_hi(vk, slot, blob)
+            if h_bytes is None:
+                return False
+            h_of[slot] = h_bytes
+        eqs = []
+        for (i, slot), m in need.items():
+            pi_b = openings.get((i, slot))
+            if pi_b is None:
+                return False
+            eqs.append((i, nodes[i], h_of[slot], m, pi_b))
+        return self._pairing_batch(eqs)
 
     def update(self, st: CVCClientState, idx: int, new_data: bytes) -> UpdateReceipt:
-        # Explicit-commit strategy
+        """Chameleon update of item idx (Construction 3).
+
+        The owner turns the data delta δ into a randomness adjustment
+        δr = -z_1·δ with the slot-1 trapdoor, so g^{r+δr}·h_1^{m+δ} equals the
+        old commitment. C_idx, every pointer above it and the root stay as they
+        are; only π_1 of the leaf changes (π_1·h_1^{δr}). For i ≠ 1 the new
+        h_i^{δr} cancels the h_{i,1}^δ term, so the other openings are unchanged.
+
+        Because C_idx is unchanged, the old (data, π_1) pair would still open
+        it. st.versions[idx] is bumped and bound into the new leaf value, so a
+        verifier holding the current st rejects the replaced data together
+        with its old proof; a verifier with an outdated st cannot tell them
+        apart.
+        """
         if not self._bootstrap or not self._pk:
             raise GroupError("setup not completed")
-        proof = self.query(idx)
-        # For demo, we don't have old_data; fetch leaf state
-        leaf = self._nodes[idx]
-        from ..common.group import H_zr as _Hzr
-        old_m = leaf["m"][0]
-        # compute delta
-        new_m = H_zr(self.grp, new_data)
-        delta_leaf = new_m - old_m
-        # apply to leaf commit and state
-        h1_b = self._bootstrap["h_list"][0]
-        leaf["m"][0] = new_m
-        leaf["C"] = self.grp.deserialize(update_commit(self.grp, self.grp.serialize(leaf["C"]), h1_b, delta_leaf))
-        # ledger for leaf data slot (not used in proof completion but kept for consistency)
-        led_leaf = leaf["ledger"]
-        led_leaf[1] = led_leaf.get(1, self.grp.init(ZR, 0)) + delta_leaf
-        # propagate upward
-        def parent(x: int) -> int:
-            return (x - 2) // self.q + 1 if x != 1 else 1
-        def slot_in_parent(x: int) -> int:
-            p = parent(x)
-            return x - (self.q * (p - 1) + 2) + 1 if x != 1 else 0
-        child = idx
-        C_child_old_b = None  # not used here; recompute pointers fresh
-        # recompute pointers using C child old/new
-        while child != 1:
-            p = parent(child)
-            slot = slot_in_parent(child)
-            slot_idx = slot + 1
-            node = self._nodes[p]
-            # pointer deltas from child C changes
-            m_ptr_old = node["m"][slot_idx - 1]
-            m_ptr_new = H_zr(self.grp, serialize_G1(self.grp, self._nodes[child]["C"]))
-            delta = m_ptr_new - m_ptr_old
-            node["m"][slot_idx - 1] = m_ptr_new
-            # update parent commit and ledger
-            hslot_b = self._bootstrap["h_list"][slot_idx - 1]
-            node["C"] = self.grp.deserialize(update_commit(self.grp, self.grp.serialize(node["C"]), hslot_b, delta))
-            led = node["ledger"]
-            led[slot_idx] = led.get(slot_idx, self.grp.init(ZR, 0)) + delta
-            child = p
-        # update root digest
-        st.root = RootDigest(value=self.grp.serialize(self._nodes[1]["C"]))
+        self._check_index(idx)
+        leaf = self._node(idx)
+        version = st.versions.get(idx, 0) + 1
+        new_m = self._leaf_value(version, new_data)
+        delta = new_m - leaf.m[1]
+        z1 = self.grp.deserialize(st.sk.trapdoors[0])
+        self._apply_chameleon(leaf, new_m, -(z1 * delta))
+        self.store.apply_cvc_updates([self._record(idx, leaf)])
+        st.versions[idx] = version
         return UpdateReceipt(index=idx, root=st.root)
 
+    def _leaf_value(self, version: int, data: bytes) -> Any:
+        # version 0 (never updated) keeps the plain hash written by append
+        if version == 0:
+            return hash_to_Zp(self.grp, data)
+        return hash_to_Zp(self.grp, b"CVC_V" + version.to_bytes(8, "big") + data)
+
+    def _leaf_m(self, st: CVCClientState, idx: int, data: bytes) -> Any:
+        """Slot-1 value that data must open to at idx under st."""
+        return self._leaf_value(st.versions.get(idx, 0), data)
+
+    def _apply_chameleon(self, node: CVCNode, new_m: Any, dr: Any) -> None:
+        """Server side of a chameleon update: m_1 ← new_m, r ← r + dr, π_1 ← π_1·h_1^dr."""
+        delta = new_m - node.m[1]
+        node.m[1] = new_m
+        node.r = node.r + dr
+        led = node.ledger
+        led[1] = led.get(1, self.grp.init(ZR, 0)) + delta
+        node.proofs[1] = node.proofs[1] * (self._tables.h(1) ** dr)
+
     def _prf(self, i: int):
         from ..common.prf import prf_zr
 
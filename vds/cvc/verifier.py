@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+"""Client-side memo for CVC verification.
+
+A node commitment that was authenticated up to the current root stays valid
+until the root changes (appends change it; chameleon updates do not), so a
+later proof can stop at the first ancestor whose commitment is already known.
+Signature checks on (h_i || i) do not depend on the root at all; they are
+remembered per verification key in a second LRU of the same capacity.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..common import sig
+
+
+class TrustedNodeCache:
+    """Bounded LRU idx -> commitment bytes, bound to one root."""
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.root: Optional[bytes] = None
+        self._nodes: "OrderedDict[int, bytes]" = OrderedDict()
+        self._sigs: "OrderedDict[Tuple[bytes, int, bytes], bool]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def sync(self, root: bytes) -> None:
+        """Drop every trusted node if the root moved."""
+        if root != self.root:
+            self._nodes.clear()
+            self.root = root
+
+    def is_trusted(self, idx: int, commit: bytes) -> bool:
+        c = self._nodes.get(idx)
+        if c is None or c != commit:
+            return False
+        self._nodes.move_to_end(idx)
+        return True
+
+    def trust(self, idx: int, commit: bytes) -> None:
+        if self.capacity <= 0:
+            return
+        self._nodes[idx] = commit
+        self._nodes.move_to_end(idx)
+        while len(self._nodes) > self.capacity:
+            self._nodes.popitem(last=False)
+
+    def check_signed_hi(self, vk: bytes, slot: int, signed: bytes) -> Optional[bytes]:
+        """Verify signed = h_i || sig over (h_i || slot); returns h_i, or None if invalid."""
+        h_bytes, sig_bytes = signed[:-64], signed[-64:]
+        key = (vk, slot, signed)
+        if key in self._sigs:
+            self._sigs.move_to_end(key)
+            return h_bytes
+        if not sig.verify(vk, h_bytes + slot.to_bytes(4, "big"), sig_bytes):
+            return None
+        # only valid triples are kept; a forged blob is re-checked every time
+        if self.capacity > 0:
+            self._sigs[key] = True
+            while len(self._sigs) > self.capacity:
+                self._sigs.popitem(last=False)
+        return h_bytes
+
+    def clear(self) -> None:
+        self._nodes.clear()
+        self._sigs.clear()
+        self.root = None
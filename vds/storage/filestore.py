@@ -1,39 +1,419 @@
 from __future__ import annotations
 
-"""Simple on-disk msgpack-backed store (skeleton)."""
+"""On-disk store implementing the MemStore interface.
+
+Keyed records (CVC nodes, ACC items) live in a pair of files per kind:
+
+- <kind>.log: append-only frames (u32 length, u32 crc32, u64 key, u8 flags,
+  payload); a rewrite appends a new version
+- <kind>.idx: header (u64 count, u64 committed log end), then one fixed-width
+  (u64 frame offset, u32 length) entry per key, so key k is found with one
+  seek into each file
+
+Frames are appended before their index entries and the header are written.
+On open, frames past the committed end are re-indexed while they are whole
+and their crc matches; the first torn or corrupt frame and everything after
+it are truncated. If the index claims more log than exists (the index reached
+disk and the log did not), the index is rebuilt from the start of the log.
+
+The ACC powers table (serialized G1, fixed width) and the packed f(X)
+coefficients live in memory-mapped GrowableArrays (acc_powers.arr,
+acc_poly.arr) that grow in place; readers get the records as views instead
+of lists. The accumulator value, the epoch and scheme roots are small
+msgpack files replaced atomically on each change.
+
+Writes are flushed to the OS immediately and fsync'ed in batches: every
+``sync_every`` write operations, on sync() and on close(), each log before
+its index. Between syncs the OS may write the files back in any order, so a
+crash guarantees only this much about the unsynced writes: torn tails are
+detected and truncated on open, and an index that got further than its log
+is rebuilt. An index entry that reached disk ahead of its frame is caught by
+the frame crc, and get() raises StorageError for that key instead of
+returning wrong data. The msgpack files are fsync'ed before each atomic
+rename, so each one is always a whole old or new version; neither they nor
+the arrays are ordered against the logs.
+"""
+
+import os
+import shutil
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import msgpack
 
 from ..common.errors import StorageError
+from ..common.types import CVCAuthPath, CVCNodeRecord, RootDigest
+from ..cvc.tree import path as cvc_path
+from .mmarray import GrowableArray
+
+_HEAD = struct.Struct(">QQ")  # count, committed log end
+_ENTRY = struct.Struct(">QI")  # frame offset, payload length
+_FRAME = struct.Struct(">IIQB")  # payload length, crc32, key, flags
+_KEYFLAGS = struct.Struct(">QB")
+_GROWS = 1  # frame advances count to its key
+
+
+def _open_rw(path: Path) -> BinaryIO:
+    if not path.exists():
+        path.touch()
+    return open(path, "r+b")
+
+
+def _crc(key: int, flags: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(_KEYFLAGS.pack(key, flags)))
+
+
+def _write_atomic(path: Path, obj: Any) -> None:
+    # the tmp file is fsync'ed before the rename: otherwise a crash can leave
+    # the new name pointing at an empty file, and the store would not open
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(msgpack.packb(obj, use_bin_type=True))
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def _read_msgpack(path: Path) -> Optional[Any]:
+    if not path.exists():
+        return None
+    return msgpack.unpackb(path.read_bytes(), raw=False, strict_map_key=False)
+
+
+def _fsync_path(path: Path) -> None:
+    if path.exists():
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class _KeyedLog:
+    """Append-only frame log plus fixed-width offset index (keys start at 1)."""
+
+    def __init__(self, base: Path, name: str) -> None:
+        self._log = _open_rw(base / f"{name}.log")
+        self._idx = _open_rw(base / f"{name}.idx")
+        head = self._idx.read(_HEAD.size)
+        if len(head) < _HEAD.size:
+            self.count, self._end = 0, 0
+            self._write_head()
+        else:
+            self.count, self._end = _HEAD.unpack(head)
+        self._recover()
+
+    def _write_head(self) -> None:
+        self._idx.seek(0)
+        self._idx.write(_HEAD.pack(self.count, self._end))
+        self._idx.flush()
+
+    def _recover(self) -> None:
+        size = self._log.seek(0, os.SEEK_END)
+        if self._end > size:
+            # index ahead of the log: rebuild it from the first frame
+            self._idx.truncate(_HEAD.size)
+            self.count, self._end = 0, 0
+        if size > self._end:
+            self._replay(size)
+
+    def _replay(self, size: int) -> None:
+        entries = []
+        pos = self._end
+        self._log.seek(pos)
+        while pos + _FRAME.size <= size:
+            length, crc, key, flags = _FRAME.unpack(self._log.read(_FRAME.size))
+            payload = self._log.read(length)
+            if key < 1 or len(payload) != length or _crc(key, flags, payload) != crc:
+                break
+            entries.append((key, pos, length, flags))
+            pos += _FRAME.size + length
+        self._log.truncate(pos)
+        self._log.flush()
+        self._commit(entries, pos)
+
+    def _commit(self, entries: List[Tuple[int, int, int, int]], end: int) -> None:
+        for key, off, length, flags in entries:
+            self._idx.seek(_HEAD.size + (key - 1) * _ENTRY.size)
+            self._idx.write(_ENTRY.pack(off, length))
+            if flags & _GROWS and key > self.count:
+                self.count = key
+        self._end = end
+        self._write_head()
+
+    def append(self, records: List[Tuple[int, bytes, int]]) -> None:
+        """Append (key, payload, flags) frames, then index them."""
+        entries = []
+        pos = self._end
+        self._log.seek(pos)
+        for key, payload, flags in records:
+            self._log.write(_FRAME.pack(len(payload), _crc(key, flags, payload), key, flags))
+            self._log.write(payload)
+            entries.append((key, pos, len(payload), flags))
+            pos += _FRAME.size + len(payload)
+        self._log.flush()
+        self._commit(entries, pos)
+
+    def get(self, key: int) -> Optional[bytes]:
+        if key < 1:
+            return None
+        self._idx.seek(_HEAD.size + (key - 1) * _ENTRY.size)
+        raw = self._idx.read(_ENTRY.size)
+        if len(raw) < _ENTRY.size:
+            return None
+        off, length = _ENTRY.unpack(raw)
+        if length == 0:
+            return None
+        self._log.seek(off)
+        head = self._log.read(_FRAME.size)
+        payload = self._log.read(length)
+        if len(head) < _FRAME.size or len(payload) != length:
+            raise StorageError(f"record {key}: log truncated")
+        n, crc, k, flags = _FRAME.unpack(head)
+        if n != length or k != key or _crc(k, flags, payload) != crc:
+            raise StorageError(f"record {key}: corrupt frame")
+        return payload
+
+    def sync(self) -> None:
+        # log before index, so a synced index never points at unsynced frames
+        for fh in (self._log, self._idx):
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def close(self) -> None:
+        for fh in (self._log, self._idx):
+            if not fh.closed:
+                fh.flush()
+                fh.close()
 
 
 class FileStore:
-    def __init__(self, base_path: str) -> None:
+    def __init__(self, base_path: str, sync_every: int = 64) -> None:
         self.base_path = base_path
+        self.sync_every = sync_every
+        self._dir = Path(base_path)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._pending = 0
+        # logs are opened on first use, so an ACC archive never creates CVC files
+        self._cvc_log: Optional[_KeyedLog] = None
+        self._acc_log: Optional[_KeyedLog] = None
+        self._powers: Optional[GrowableArray] = None
+        self._poly: Optional[GrowableArray] = None
+        self._acc: Dict[str, Any] = _read_msgpack(self._dir / "acc_state.msgpack") or self._empty_acc(0)
+        self._roots: Dict[str, bytes] = _read_msgpack(self._dir / "roots.msgpack") or {}
+        self._archives: Dict[int, "FileStore"] = {}
 
-    # Implementations intentionally omitted in scaffold
-    def set_root(self, scheme: str, root):  # type: ignore[no-untyped-def]
-        raise StorageError("FileStore not implemented in scaffold.")
+    @staticmethod
+    def _empty_acc(epoch: int) -> Dict[str, Any]:
+        return {"value": None, "epoch": epoch}
 
-    def get_root(self, scheme: str):  # type: ignore[no-untyped-def]
-        raise StorageError("FileStore not implemented in scaffold.")
+    def _cvc(self) -> _KeyedLog:
+        if self._cvc_log is None:
+            self._cvc_log = _KeyedLog(self._dir, "cvc_nodes")
+        return self._cvc_log
 
-    def put_cvc_insert_path(self, leaf, parents):  # type: ignore[no-untyped-def]
-        raise StorageError("FileStore not implemented in scaffold.")
+    def _acc_items(self) -> _KeyedLog:
+        if self._acc_log is None:
+            self._acc_log = _KeyedLog(self._dir, "acc_items")
+        return self._acc_log
 
-    def get_cvc_auth_path(self, idx: int):
-        raise StorageError("FileStore not implemented in scaffold.")
+    def _powers_arr(self) -> GrowableArray:
+        if self._powers is None:
+            self._powers = GrowableArray(self._dir / "acc_powers.arr")
+        return self._powers
 
-    def apply_cvc_updates(self, update_tokens):  # type: ignore[no-untyped-def]
-        raise StorageError("FileStore not implemented in scaffold.")
+    def _poly_arr(self) -> GrowableArray:
+        # byte-granular: the coefficient width belongs to vds.acc.poly.pack_coeffs
+        if self._poly is None:
+            self._poly = GrowableArray(self._dir / "acc_poly.arr", width=1, capacity=4096)
+        return self._poly
 
+    def _close_acc(self) -> None:
+        if self._acc_log is not None:
+            self._acc_log.close()
+            self._acc_log = None
+        for arr in (self._powers, self._poly):
+            if arr is not None:
+                arr.close()
+        self._powers = self._poly = None
+
+    def _wrote(self) -> None:
+        self._pending += 1
+        if self.sync_every > 0 and self._pending >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """fsync every log, index and state file written since the last sync."""
+        for log in (self._cvc_log, self._acc_log):
+            if log is not None:
+                log.sync()
+        for arr in (self._powers, self._poly):
+            if arr is not None:
+                arr.flush()
+        _fsync_path(self._dir / "acc_state.msgpack")
+        _fsync_path(self._dir / "roots.msgpack")
+        _fsync_path(self._dir)
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._pending:
+            self.sync()
+        if self._cvc_log is not None:
+            self._cvc_log.close()
+        self._close_acc()
+        for old in self._archives.values():
+            old.close()
+
+    def __enter__(self) -> "FileStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # --- Common root management ---
+    def set_root(self, scheme: str, root: RootDigest) -> None:
+        self._roots[scheme] = root.value
+        _write_atomic(self._dir / "roots.msgpack", self._roots)
+        self._wrote()
+
+    def get_root(self, scheme: str) -> RootDigest:
+        if scheme not in self._roots:
+            raise StorageError(f"root for scheme {scheme} not set")
+        return RootDigest(value=self._roots[scheme])
+
+    # --- CVC ---
+    def _write_nodes(self, nodes: List[CVCNodeRecord], first_flags: int = 0) -> None:
+        self._cvc().append(
+            [
+                (n.idx, msgpack.packb(n.model_dump(), use_bin_type=True), first_flags if k == 0 else 0)
+                for k, n in enumerate(nodes)
+            ]
+        )
+        self._wrote()
+
+    def put_cvc_insert_path(self, leaf: CVCNodeRecord, parents: List[CVCNodeRecord]) -> None:
+        # only the leaf frame advances the count; replay after a crash relies on it
+        self._write_nodes([leaf] + list(parents), first_flags=_GROWS)
+
+    def get_cvc_node(self, idx: int) -> CVCNodeRecord:
+        blob = self._cvc().get(idx)
+        if blob is None:
+            raise StorageError(f"CVC node {idx} not found")
+        return CVCNodeRecord(**msgpack.unpackb(blob, raw=False, strict_map_key=False))
+
+    def get_cvc_auth_path(self, idx: int, q: int) -> CVCAuthPath:
+        return CVCAuthPath(nodes=[self.get_cvc_node(i) for i in cvc_path(idx, q)])
+
+    def apply_cvc_updates(self, nodes: List[CVCNodeRecord]) -> None:
+        self._write_nodes(list(nodes))
+
+    def cvc_count(self) -> int:
+        return self._cvc().count
+
+    # --- ACC ---
+    # Items are keyed by idx (contiguous from 1), so acc_count is the highest idx.
     def save_acc_item(self, idx: int, data: bytes, tag: bytes, sigma: bytes) -> None:
-        raise StorageError("FileStore not implemented in scaffold.")
+        payload = msgpack.packb([data, tag, idx, sigma], use_bin_type=True)
+        self._acc_items().append([(idx, payload, _GROWS)])
+        self._wrote()
+
+    def get_acc_item(self, idx: int) -> Tuple[bytes, bytes, int, bytes]:
+        blob = self._acc_items().get(idx)
+        if blob is None:
+            raise StorageError("ACC item not found")
+        data, tag, i, sigma = msgpack.unpackb(blob, raw=False)
+        return data, tag, i, sigma
+
+    def acc_count(self) -> int:
+        return self._acc_items().count
+
+    def iter_acc_items(self) -> Iterator[Tuple[bytes, bytes, int, bytes]]:
+        for idx in range(1, self.acc_count() + 1):
+            if self._acc_items().get(idx) is not None:
+                yield self.get_acc_item(idx)
+
+    def _save_acc(self) -> None:
+        _write_atomic(self._dir / "acc_state.msgpack", self._acc)
+        self._wrote()
+
+    def set_acc_state(self, acc_value: bytes, cache: List[bytes]) -> None:
+        powers = self._powers_arr()
+        powers.clear()
+        powers.extend(cache)
+        self._acc["value"] = acc_value
+        self._save_acc()
+
+    def set_acc_value(self, acc_value: bytes) -> None:
+        self._acc["value"] = acc_value
+        self._save_acc()
+
+    def get_acc_state(self) -> Tuple[bytes, List[bytes]]:
+        if self._acc["value"] is None:
+            raise StorageError("ACC state not set")
+        return self._acc["value"], list(self._powers_arr())
+
+    def get_acc_value(self) -> bytes:
+        if self._acc["value"] is None:
+            raise StorageError("ACC state not set")
+        return self._acc["value"]
+
+    def acc_powers(self) -> GrowableArray:
+        """The powers table as a read-only sequence over the mapped file."""
+        return self._powers_arr()
+
+    # Polynomial coefficients for f(X), packed as in MemStore (vds.acc.poly.pack_coeffs)
+    def set_acc_poly(self, coeffs: bytes) -> None:
+        self._poly_arr().assign(coeffs)
+        self._wrote()
+
+    def get_acc_poly(self) -> memoryview:
+        """Zero-copy view of the packed coefficients; read it before the next write."""
+        return self._poly_arr().view()
+
+    def append_powers(self, new: List[bytes]) -> None:
+        self._powers_arr().extend(new)
+        self._wrote()
+
+    # --- ACC epochs ---
+    # A retired epoch is moved to acc_epochs/<epoch>/ and served by its own FileStore.
+    def acc_epoch(self) -> int:
+        return self._acc["epoch"]
+
+    def set_acc_epoch(self, epoch: int) -> None:
+        self._acc["epoch"] = epoch
+        self._save_acc()
 
-    def get_acc_item(self, idx: int):  # type: ignore[no-untyped-def]
-        raise StorageError("FileStore not implemented in scaffold.")
+    def _archive_dir(self, epoch: int) -> Path:
+        return self._dir / "acc_epochs" / str(epoch)
 
-    def set_acc_state(self, acc_value: bytes, cache):  # type: ignore[no-untyped-def]
-        raise StorageError("FileStore not implemented in scaffold.")
+    def begin_acc_epoch(self) -> "FileStore":
+        """Move the current ACC files into the archive and start an empty epoch."""
+        old_epoch = self._acc["epoch"]
+        dest = self._archive_dir(old_epoch)
+        if dest.exists():
+            raise StorageError(f"ACC epoch {old_epoch} already archived")
+        self.sync()
+        self._close_acc()
+        dest.mkdir(parents=True)
+        for name in ("acc_items.log", "acc_items.idx", "acc_state.msgpack", "acc_powers.arr", "acc_poly.arr"):
+            if (self._dir / name).exists():
+                os.replace(self._dir / name, dest / name)
+        self._acc = self._empty_acc(old_epoch + 1)
+        self._save_acc()
+        return self.get_acc_archive(old_epoch)
 
-    def get_acc_state(self):  # type: ignore[no-untyped-def]
-        raise StorageError("FileStore not implemented in scaffold.")
+    def get_acc_archive(self, epoch: int) -> "FileStore":
+        if epoch not in self._archives:
+            dest = self._archive_dir(epoch)
+            if not dest.is_dir():
+                raise StorageError(f"ACC epoch {epoch} not available")
+            self._archives[epoch] = FileStore(str(dest), sync_every=self.sync_every)
+        return self._archives[epoch]
 
+    def drop_acc_archive(self, epoch: int) -> None:
+        old = self._archives.pop(epoch, None)
+        if old is not None:
+            old.close()
+        shutil.rmtree(self._archive_dir(epoch), ignore_errors=True)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 
 from ..common.types import (
     RootDigest,
@@ -8,18 +8,23 @@ from ..common.types import (
     CVCAuthPath,
 )
 from ..common.errors import StorageError
+from ..cvc.tree import path as cvc_path
 
 
 class MemStore:
     def __init__(self) -> None:
         self._roots: Dict[str, RootDigest] = {}
         self.nodes: Dict[int, CVCNodeRecord] = {}
+        self._cvc_count: int = 0
         self._acc_items: Dict[int, Tuple[bytes, bytes, int, bytes]] = {}
         self._acc_value: Optional[bytes] = None
         self._acc_cache: List[bytes] = []
-        self._acc_poly_coeffs: List[bytes] = []  # ascending coeffs over ZR, serialized
+        self._acc_poly_coeffs: bytes = b""  # ascending coeffs mod group order, packed fixed-width
         self._acc_version: str | None = None
         self._acc_curve: str | None = None
+        # ACC epochs: retired epochs stay readable until cut-over
+        self._acc_epoch: int = 0
+        self._acc_archive: Dict[int, "MemStore"] = {}
 
     # --- Common root management ---
     def set_root(self, scheme: str, root: RootDigest) -> None:
@@ -31,18 +36,29 @@ class MemStore:
         return self._roots[scheme]
 
     # --- CVC ---
+    # Nodes are keyed by heap index; an insert path is the new leaf plus the
+    # ancestors whose pointer slots it changed.
     def put_cvc_insert_path(self, leaf: CVCNodeRecord, parents: List[CVCNodeRecord]) -> None:
         self.nodes[leaf.idx] = leaf
         for p in parents:
             self.nodes[p.idx] = p
+        self._cvc_count = max(self._cvc_count, leaf.idx)
 
-    def get_cvc_auth_path(self, idx: int) -> CVCAuthPath:
-        # Skeleton: without real tree, return empty path
-        return CVCAuthPath(segments=[])
+    def get_cvc_node(self, idx: int) -> CVCNodeRecord:
+        if idx not in self.nodes:
+            raise StorageError(f"CVC node {idx} not found")
+        return self.nodes[idx]
 
-    def apply_cvc_updates(self, update_tokens: List[bytes]) -> None:
-        # Skeleton: no-op
-        return
+    def get_cvc_auth_path(self, idx: int, q: int) -> CVCAuthPath:
+        return CVCAuthPath(nodes=[self.get_cvc_node(i) for i in cvc_path(idx, q)])
+
+    def apply_cvc_updates(self, nodes: List[CVCNodeRecord]) -> None:
+        """Overwrite (or create) node records in place; the item count is unchanged."""
+        for n in nodes:
+            self.nodes[n.idx] = n
+
+    def cvc_count(self) -> int:
+        return self._cvc_count
 
     # --- ACC ---
     def save_acc_item(self, idx: int, data: bytes, tag: bytes, sigma: bytes) -> None:
@@ -57,21 +73,72 @@ class MemStore:
         self._acc_value = acc_value
         self._acc_cache = list(cache)
 
+    def set_acc_value(self, acc_value: bytes) -> None:
+        self._acc_value = acc_value
+
     def get_acc_state(self) -> Tuple[bytes, List[bytes]]:
         if self._acc_value is None:
             raise StorageError("ACC state not set")
         return self._acc_value, list(self._acc_cache)
 
-    # Polynomial coefficients for f(X) = prod (X + x_i), ascending, elements in ZR serialized
-    def set_acc_poly(self, coeffs: List[bytes]) -> None:
-        self._acc_poly_coeffs = list(coeffs)
+    def get_acc_value(self) -> bytes:
+        if self._acc_value is None:
+            raise StorageError("ACC state not set")
+        return self._acc_value
+
+    def acc_powers(self) -> List[bytes]:
+        """The powers table itself (no copy); callers must not modify it."""
+        return self._acc_cache
 
-    def get_acc_poly(self) -> List[bytes]:
-        return list(self._acc_poly_coeffs)
+    # Polynomial coefficients for f(X) = prod (X + x_i), ascending, packed as
+    # fixed-width big-endian ints mod the group order (see vds.acc.poly.pack_coeffs)
+    def set_acc_poly(self, coeffs: bytes) -> None:
+        self._acc_poly_coeffs = bytes(coeffs)
+
+    def get_acc_poly(self) -> bytes:
+        return self._acc_poly_coeffs
 
     def acc_count(self) -> int:
         return len(self._acc_items)
 
+    def iter_acc_items(self) -> Iterator[Tuple[bytes, bytes, int, bytes]]:
+        for idx in sorted(self._acc_items):
+            yield self._acc_items[idx]
+
+    # --- ACC epochs ---
+    def acc_epoch(self) -> int:
+        return self._acc_epoch
+
+    def set_acc_epoch(self, epoch: int) -> None:
+        self._acc_epoch = epoch
+
+    def begin_acc_epoch(self) -> "MemStore":
+        """Move the current ACC state into the archive and start an empty epoch.
+
+        Returns the archived epoch as a read-only MemStore.
+        """
+        old = MemStore()
+        old._acc_items = self._acc_items
+        old._acc_value = self._acc_value
+        old._acc_cache = self._acc_cache
+        old._acc_poly_coeffs = self._acc_poly_coeffs
+        old._acc_epoch = self._acc_epoch
+        self._acc_archive[self._acc_epoch] = old
+        self._acc_items = {}
+        self._acc_value = None
+        self._acc_cache = []
+        self._acc_poly_coeffs = b""
+        self._acc_epoch += 1
+        return old
+
+    def get_acc_archive(self, epoch: int) -> "MemStore":
+        if epoch not in self._acc_archive:
+            raise StorageError(f"ACC epoch {epoch} not available")
+        return self._acc_archive[epoch]
+
+    def drop_acc_archive(self, epoch: int) -> None:
+        self._acc_archive.pop(epoch, None)
+
     # Powers append (for performance API)
     def append_powers(self, new: List[bytes]) -> None:
         self._acc_cache.extend(new)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+"""Fixed-width record arrays over a memory-mapped file region.
+
+Record k of an array lives at ``offset + k * width``; nothing is parsed until
+a record is read, so opening a large file costs one mmap call. An all-zero
+record means "unset" (serialized group elements and packed entries never
+start with a zero byte in the formats that use this).
+"""
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from ..common.errors import StorageError
+
+
+def map_file(path: Union[str, Path], writable: bool = True) -> mmap.mmap:
+    """mmap the whole file; read-only when writable is False."""
+    try:
+        with open(path, "r+b" if writable else "rb") as fh:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise StorageError(f"cannot map {path}: {e}") from e
+
+
+class FixedWidthArray:
+    def __init__(self, buf: mmap.mmap, offset: int, count: int, width: int):
+        if offset + count * width > len(buf):
+            raise StorageError("fixed-width array exceeds mapped region")
+        self._buf = buf
+        self.offset = offset
+        self.count = count
+        self.width = width
+        self._zero = bytes(width)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _pos(self, k: int) -> int:
+        if not 0 <= k < self.count:
+            raise IndexError(k)
+        return self.offset + k * self.width
+
+    def __getitem__(self, k: int) -> bytes:
+        pos = self._pos(k)
+        return self._buf[pos : pos + self.width]
+
+    def __setitem__(self, k: int, value: bytes) -> None:
+        if len(value) != self.width:
+            raise StorageError(f"record width {len(value)} != {self.width}")
+        pos = self._pos(k)
+        self._buf[pos : pos + self.width] = value
+
+    def get(self, k: int) -> Optional[bytes]:
+        """Record k, or None while it is still all zero."""
+        b = self[k]
+        return None if b == self._zero else b
+
+
+_GROW_HEAD = struct.Struct(">QI")
+_GROW_HEADER = 16  # header padded so records start aligned
+
+
+class GrowableArray:
+    """Fixed-width records in their own file, appended in place.
+
+    The file holds a 16-byte header (u64 count, u32 width) followed by the
+    records and some spare capacity; appends write into the spare capacity
+    and the file doubles when it runs out. ``width`` may be 0 on creation and
+    is then taken from the first record written. view() returns a memoryview
+    of the live records, so readers never copy the table.
+    """
+
+    def __init__(self, path: Union[str, Path], width: int = 0, capacity: int = 64):
+        self.path = Path(path)
+        if not self.path.exists() or self.path.stat().st_size < _GROW_HEADER:
+            with open(self.path, "wb") as fh:
+                fh.write(_GROW_HEAD.pack(0, width).ljust(_GROW_HEADER, b"\0"))
+                fh.truncate(_GROW_HEADER + capacity * max(width, 1))
+        self._buf = map_file(self.path)
+        self.count, self.width = _GROW_HEAD.unpack(self._buf[: _GROW_HEAD.size])
+        if _GROW_HEADER + self.count * self.width > len(self._buf):
+            raise StorageError(f"{self.path}: header count exceeds file size")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _pos(self, k: int) -> int:
+        if k < 0:
+            k += self.count
+        if not 0 <= k < self.count:
+            raise IndexError(k)
+        return _GROW_HEADER + k * self.width
+
+    def __getitem__(self, k: int) -> bytes:
+        pos = self._pos(k)
+        return self._buf[pos : pos + self.width]
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.iter(0, self.count)
+
+    def iter(self, start: int, stop: int) -> Iterator[bytes]:
+        """Records start..stop-1, read one at a time."""
+        buf, w = self._buf, self.width
+        for pos in range(_GROW_HEADER + start * w, _GROW_HEADER + min(stop, self.count) * w, w):
+            yield buf[pos : pos + w]
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the live records (count·width bytes).
+
+        Valid until the next write that grows the file; the old mapping stays
+        alive for as long as the view does.
+        """
+        return memoryview(self._buf)[_GROW_HEADER : _GROW_HEADER + self.count * self.width]
+
+    def _reserve(self, n: int) -> None:
+        need = _GROW_HEADER + n * self.width
+        if need <= len(self._buf):
+            return
+        size = max(need, 2 * len(self._buf))
+        os.truncate(self.path, size)
+        # outstanding views keep the old map alive; it is not closed here
+        self._buf = map_file(self.path)
+
+    def _set_count(self, count: int) -> None:
+        self.count = count
+        self._buf[: _GROW_HEAD.size] = _GROW_HEAD.pack(count, self.width)
+
+    def extend(self, records: Iterable[bytes]) -> None:
+        records = list(records)
+        if not records:
+            return
+        if self.width == 0:
+            self.width = len(records[0])
+        if any(len(r) != self.width for r in records):
+            raise StorageError(f"record width != {self.width}")
+        self._reserve(self.count + len(records))
+        pos = _GROW_HEADER + self.count * self.width
+        self._buf[pos : pos + len(records) * self.width] = b"".join(records)
+        self._set_count(self.count + len(records))
+
+    def assign(self, raw: bytes) -> None:
+        """Replace all records with raw, a packed run of width-sized records."""
+        if self.width == 0 or len(raw) % self.width:
+            raise StorageError(f"{len(raw)} bytes is not a whole number of {self.width}-byte records")
+        n = len(raw) // self.width
+        self._reserve(n)
+        self._buf[_GROW_HEADER : _GROW_HEADER + len(raw)] = raw
+        self._set_count(n)
+
+    def clear(self) -> None:
+        self._set_count(0)
+
+    def flush(self) -> None:
+        self._buf.flush()
+
+    def close(self) -> None:
+        try:
+            self._buf.close()
+        except BufferError:  # a view is still alive; the map goes with it
+            pass